@@ -1,34 +1,46 @@
+import numpy as np
 import pandas as pd
-from glob import glob
 
 # Parameters
 input_files = ["0back.txt", "1back.txt", "2back.txt", "instr.txt"]
 output_file = "task-fracback_acq-singleband_events.tsv"
 
 # Function to merge consecutive blocks
-def merge_blocks(df, trial_type):
-    df = df.sort_values("onset").reset_index(drop=True)
-    blocks = []
-    current_block = {"onset": df.loc[0, "onset"], "duration": df.loc[0, "duration"]}
-    for i in range(1, len(df)):
-        if df.loc[i, "onset"] == current_block["onset"] + current_block["duration"]:
-            current_block["duration"] += df.loc[i, "duration"]
-        else:
-            blocks.append(current_block)
-            current_block = {"onset": df.loc[i, "onset"], "duration": df.loc[i, "duration"]}
-    blocks.append(current_block)
-    return pd.DataFrame(blocks).assign(trial_type=trial_type)
+def merge_blocks(onset, duration):
+    # A block starts wherever an onset does not line up with the end of the
+    # previous trial; summing durations over each contiguous run with
+    # np.add.reduceat replaces the row-by-row .loc loop.
+    order = np.argsort(onset, kind="stable")
+    onset = onset[order]
+    duration = duration[order]
 
-# Process all files and combine them
+    starts = np.empty(len(onset), dtype=bool)
+    starts[0] = True
+    starts[1:] = onset[1:] != onset[:-1] + duration[:-1]
+    start_idx = np.nonzero(starts)[0]
+
+    return onset[start_idx], np.add.reduceat(duration, start_idx)
+
+# Process all files and combine them; the tiny 3-column TSVs go straight
+# through np.loadtxt (the third column is ignored) instead of a pandas
+# parser per file, and only the final combined table becomes a DataFrame.
 all_events = []
 for file in input_files:
     trial_type = file.split(".")[0]  # Extract trial type from file name
-    df = pd.read_csv(file, sep="\t", header=None, names=["onset", "duration", "ignore"])
-    merged_df = merge_blocks(df, trial_type)
-    all_events.append(merged_df)
+    data = np.loadtxt(file, usecols=(0, 1), ndmin=2)
+    onsets, durations = merge_blocks(data[:, 0], data[:, 1])
+    all_events.append((onsets, durations, trial_type))
 
 # Combine all trial types and save to a BIDS-compatible file
-events = pd.concat(all_events).sort_values("onset").reset_index(drop=True)
+onsets = np.concatenate([e[0] for e in all_events])
+durations = np.concatenate([e[1] for e in all_events])
+trial_types = np.concatenate(
+    [np.full(len(e[0]), e[2], dtype=object) for e in all_events]
+)
+order = np.argsort(onsets, kind="stable")
+events = pd.DataFrame(
+    {"onset": onsets[order], "duration": durations[order], "trial_type": trial_types[order]}
+)
 events.to_csv(output_file, sep="\t", index=False)
 
 print(f"Events file created: {output_file}")
\ No newline at end of file
@@ -1,4 +1,11 @@
 #!/usr/bin/env python3
+"""Remove run entities from selected BIDS files and fix IntendedFor references.
+
+This is the single canonical copy of this script; update_intended_for combines
+the substring prefilter fast path with the compiled-regex rewrite so there is
+no second variant to keep in sync (and no reason to walk the tree twice).
+"""
+import argparse
 import os
 import json
 import pandas as pd
@@ -6,10 +13,17 @@ import re
 import subprocess
 from pathlib import Path
 
+# Compiled once at module scope; the IntendedFor loop below only does a
+# substring prefilter per path and a single sub() on actual matches.
+SUBJECT_DIR_RE = re.compile(r'(/sub-[^/]+/)')
+RUN_ENTITY_RE = re.compile(r'_run-(\d+)')
+RUN0_ENTITY_RE = re.compile(r'_run-0\d+')
+NII_GZ_RE = re.compile(r'\.nii\.gz$')
+
 def update_intended_for(bids_dir, old_path, new_path):
     """Update IntendedFor references in fieldmap JSON files"""
     # Extract subject ID from the path
-    match = re.search(r'(/sub-[^/]+/)', old_path)
+    match = SUBJECT_DIR_RE.search(old_path)
     if not match:
         print(f"Could not extract subject ID from path: {old_path}")
         return
@@ -28,12 +42,13 @@ def update_intended_for(bids_dir, old_path, new_path):
     new_rel_path = re.sub(f'^/?{subject_id}/', '', new_path.lstrip('/'))
 
     # Get the run entity from the old path
-    run_match = re.search(r'_run-(\d+)', old_rel_path)
+    run_match = RUN_ENTITY_RE.search(old_rel_path)
     if not run_match:
         print(f"No run entity found in path: {old_rel_path}")
         return
 
     run_number = run_match.group(1)
+    run_token = f"_run-{run_number}_"
     print(f"Found run-{run_number} in path: {old_rel_path}")
 
     # Process each fieldmap JSON file - fix the glob pattern
@@ -59,11 +74,12 @@ def update_intended_for(bids_dir, old_path, new_path):
             for i, path in enumerate(data['IntendedFor']):
                 print(f"  Checking path: {path}")
 
-                # Look for the run entity in the path
-                if f"_run-{run_number}_" in path:
+                # Look for the run entity in the path (substring check only;
+                # the regex sub runs just for actual matches)
+                if run_token in path:
                     print(f"  Found matching run entity in: {path}")
                     # Create the new path by removing the run entity
-                    updated_path = re.sub(r'_run-\d+', '', path)
+                    updated_path = RUN_ENTITY_RE.sub('', path)
                     data['IntendedFor'][i] = updated_path
                     updated = True
                     print(f"  Updated to: {updated_path}")
@@ -82,7 +98,7 @@ def update_intended_for(bids_dir, old_path, new_path):
         except Exception as e:
             print(f"Error updating {json_file}: {e}")
 
-def process_files(bids_dir, tsv_path):
+def process_files(bids_dir, tsv_path, subjects=None):
     # Target KeyParamGroup patterns
     target_patterns = [
         'datatype-func_run-02_suffix-bold_task-rest_acquisition-multiband__1',
@@ -105,6 +121,14 @@ def process_files(bids_dir, tsv_path):
     # Filter rows matching target patterns
     matching_rows = df[df['KeyParamGroup'].isin(target_patterns)]
 
+    # Optionally restrict to specific subjects (for parallel sharding)
+    if subjects:
+        matching_rows = matching_rows[
+            matching_rows['FilePath'].apply(
+                lambda p: any(sub in p for sub in subjects)
+            )
+        ]
+
     if matching_rows.empty:
         print("No matching rows found in the TSV file")
         return
@@ -117,7 +141,7 @@ def process_files(bids_dir, tsv_path):
         file_path = os.path.join(bids_dir, row['FilePath'].lstrip('/'))
 
         # Get the JSON sidecar path
-        json_path = re.sub(r'\.nii\.gz$', '.json', file_path)
+        json_path = NII_GZ_RE.sub('.json', file_path)
 
         # Check if files exist
         if not os.path.exists(file_path):
@@ -131,10 +155,10 @@ def process_files(bids_dir, tsv_path):
         # Create new filenames by removing run-0* entity
         dir_name = os.path.dirname(file_path)
         file_name = os.path.basename(file_path)
-        new_file_name = re.sub(r'_run-0\d+', '', file_name)
+        new_file_name = RUN0_ENTITY_RE.sub('', file_name)
         new_file_path = os.path.join(dir_name, new_file_name)
 
-        new_json_name = re.sub(r'_run-0\d+', '', os.path.basename(json_path))
+        new_json_name = RUN0_ENTITY_RE.sub('', os.path.basename(json_path))
         new_json_path = os.path.join(os.path.dirname(json_path), new_json_name)
 
         # Check if destination files already exist
@@ -167,9 +191,24 @@ def main():
     print("BIDS IntendedFor Path Updater")
     print("=============================")
 
-    # Get input paths
-    bids_dir = input("Enter the path to the BIDS directory: ").strip()
-    tsv_path = input("Enter the path to the files.tsv file: ").strip()
+    parser = argparse.ArgumentParser(
+        description="Remove run entities from selected BIDS files and update IntendedFor references"
+    )
+    parser.add_argument(
+        "--bids-dir", type=Path, required=True, help="Path to the BIDS directory"
+    )
+    parser.add_argument(
+        "--tsv", type=Path, required=True, help="Path to the files.tsv file"
+    )
+    parser.add_argument(
+        "--subjects",
+        nargs="*",
+        help="Restrict to these sub-IDs for parallel sharding",
+    )
+    args = parser.parse_args()
+
+    bids_dir = str(args.bids_dir)
+    tsv_path = str(args.tsv)
 
     # Validate inputs
     if not os.path.isdir(bids_dir):
@@ -181,7 +220,7 @@ def main():
         return
 
     # Process the files
-    process_files(bids_dir, tsv_path)
+    process_files(bids_dir, tsv_path, subjects=args.subjects)
     print("Processing complete!")
 
 if __name__ == "__main__":
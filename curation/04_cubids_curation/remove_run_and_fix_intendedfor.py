@@ -30,6 +30,8 @@ from __future__ import annotations
 
 import argparse
 import json
+import mmap
+import os
 import re
 import sys
 from dataclasses import dataclass
@@ -40,6 +42,30 @@ from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 RUN_TOKEN_RE = re.compile(r"_run-\d+")
 
+# Sidecar recording the mtime of each fmap JSON after its last successful
+# IntendedFor update; lets idempotent re-runs skip unchanged files.
+STATE_FILE_NAME = ".grmpy_curation_state.json"
+
+
+def load_curation_state(bids_dir: Path) -> Dict[str, int]:
+    """Load the per-file mtime cache from a previous run, if any."""
+    state_path = bids_dir / STATE_FILE_NAME
+    try:
+        loaded = json.loads(state_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(loaded, dict):
+        return {}
+    return {str(k): v for k, v in loaded.items() if isinstance(v, int)}
+
+
+def save_curation_state(bids_dir: Path, state: Dict[str, int]) -> None:
+    state_path = bids_dir / STATE_FILE_NAME
+    try:
+        state_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+    except OSError as exc:  # noqa: BLE001
+        print(f"WARNING: Could not write {state_path}: {exc}", file=sys.stderr)
+
 
 @dataclass
 class RenamePlan:
@@ -98,38 +124,96 @@ def candidate_sidecars(img_path: Path) -> Iterable[Path]:
         yield img_path.with_name(f"{stem}{ext}")
 
 
-def compute_rename_plans(bids_dir: Path) -> List[RenamePlan]:
-    """Find files with a run- entity and plan renames to remove it."""
+def scan_bids(
+    bids_dir: Path,
+) -> Tuple[
+    List[RenamePlan],
+    Dict[str, Set[Optional[str]]],
+    Dict[Tuple[str, Optional[str]], List[Path]],
+]:
+    """Walk the BIDS tree once, collecting everything later phases need.
+
+    Returns a tuple of:
+      - rename plans for files whose stem contains a run- entity,
+      - sessions observed per subject (from NIfTI files; None if no session),
+      - fmap JSON paths keyed by (subject, session).
+
+    A single os.scandir-based recursion replaces the separate rglob passes
+    previously done by the rename planner and the IntendedFor updater.
+    """
     plans: List[RenamePlan] = []
     planned_dsts: Set[Path] = set()
+    sessions_by_subject: Dict[str, Set[Optional[str]]] = {}
+    fmap_jsons: Dict[Tuple[str, Optional[str]], List[Path]] = {}
 
-    # Consider both image and non-image files; but we will primarily use image
-    # renames to drive IntendedFor mapping. We include sidecars separately.
-    for src in bids_dir.rglob("*"):
-        if not src.is_file():
-            continue
-        # Only consider BIDS-like files that include _run-<digits>
-        if not RUN_TOKEN_RE.search(src.name):
-            continue
+    def visit(dir_path: Path) -> None:
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError as exc:  # noqa: BLE001
+            print(f"WARNING: Could not scan {dir_path}: {exc}", file=sys.stderr)
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                visit(path)
+                continue
+            if not entry.is_file():
+                continue
+            name = entry.name
+
+            ss = subject_and_session_from_path(path)
+            if ss and (name.endswith(".nii") or name.endswith(".nii.gz")):
+                subject, session = ss
+                sessions_by_subject.setdefault(subject, set()).add(session)
+            if ss and dir_path.name == "fmap" and name.endswith(".json"):
+                subject, session = ss
+                fmap_jsons.setdefault((subject, session), []).append(path)
+
+            # Only consider BIDS-like files that include _run-<digits>
+            if not RUN_TOKEN_RE.search(name):
+                continue
+
+            stem, suffix = split_name_suffix(name)
+            new_stem = RUN_TOKEN_RE.sub("", stem)
+            if new_stem == stem:
+                continue
+            dst = path.with_name(f"{new_stem}{suffix}")
+
+            # Detect collision either with existing file or another planned dst
+            if dst.exists() or dst in planned_dsts:
+                print(
+                    f"WARNING: Skipping due to destination collision: {path} -> {dst}",
+                    file=sys.stderr,
+                )
+                continue
 
-        stem, suffix = split_name_suffix(src.name)
-        new_stem = RUN_TOKEN_RE.sub("", stem)
-        if new_stem == stem:
-            continue
-        dst = src.with_name(f"{new_stem}{suffix}")
+            plans.append(RenamePlan(src=path, dst=dst))
+            planned_dsts.add(dst)
 
-        # Detect collision either with existing file or another planned dst
-        if dst.exists() or dst in planned_dsts:
-            print(
-                f"WARNING: Skipping due to destination collision: {src} -> {dst}",
-                file=sys.stderr,
-            )
-            continue
+    visit(bids_dir)
+    return plans, sessions_by_subject, fmap_jsons
 
-        plans.append(RenamePlan(src=src, dst=dst))
-        planned_dsts.add(dst)
 
-    return plans
+def any_fmap_json_mentions_run(
+    fmap_jsons: Dict[Tuple[str, Optional[str]], List[Path]]
+) -> bool:
+    """Cheap byte-level precheck: does any fmap JSON contain a run- token?
+
+    Uses mmap to scan without copying the file contents. Unreadable files are
+    treated as potentially containing a token so they still get processed.
+    """
+    for paths in fmap_jsons.values():
+        for path in paths:
+            try:
+                if path.stat().st_size == 0:
+                    continue
+                with path.open("rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if mm.find(b"_run-") != -1:
+                            return True
+            except OSError:
+                return True
+    return False
 
 
 def build_intendedfor_mapping(
@@ -187,16 +271,14 @@ def sidecars_for_plan(plan: RenamePlan) -> List[RenamePlan]:
 
 
 def apply_renames(plans: Sequence[RenamePlan], dry_run: bool) -> None:
+    # No per-plan dst.exists() precheck here: scan_bids already rejects plans
+    # whose destination exists or collides with another planned dst, so the
+    # extra stat() per rename would be a wasted syscall. Destinations are in
+    # the same directory as their sources, so no parent dirs need creating.
     for plan in plans:
         print(f"RENAME: {plan.src} -> {plan.dst}")
         if dry_run:
             continue
-        if plan.dst.exists():
-            print(
-                f"WARNING: Destination already exists, skipping: {plan.dst}",
-                file=sys.stderr,
-            )
-            continue
         try:
             subprocess.run(["git", "mv", str(plan.src), str(plan.dst)], check=True)
         except subprocess.CalledProcessError as exc:  # noqa: BLE001
@@ -206,18 +288,6 @@ def apply_renames(plans: Sequence[RenamePlan], dry_run: bool) -> None:
             )
 
 
-def list_fmap_jsons_for_session(
-    bids_dir: Path, subject: str, session: Optional[str]
-) -> List[Path]:
-    base = bids_dir / subject
-    if session:
-        base = base / session
-    fmap_dir = base / "fmap"
-    if not fmap_dir.exists() or not fmap_dir.is_dir():
-        return []
-    return [p for p in fmap_dir.glob("*.json") if p.is_file()]
-
-
 def ensure_list(value: object) -> List[str]:
     if value is None:
         return []
@@ -312,8 +382,15 @@ def update_intendedfor_in_json(
             data["IntendedFor"] = (
                 updated_unique if len(updated_unique) != 1 else updated_unique
             )
-            with json_path.open("w") as f:
-                json.dump(data, f, indent=2, sort_keys=True)
+            # Serialize in memory and emit with one write() syscall, rather
+            # than many small buffered writes through a TextIOWrapper; this
+            # matters when BIDS dirs live on high-latency network storage.
+            payload = json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+            fd = os.open(str(json_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
         except Exception as exc:  # noqa: BLE001
             print(f"WARNING: Failed writing JSON {json_path}: {exc}", file=sys.stderr)
             return False, changes
@@ -324,31 +401,42 @@ def update_intendedfor_in_json(
 def update_all_fmap_intendedfor(
     bids_dir: Path,
     rel_map: Dict[str, str],
+    sessions_by_subject: Dict[str, Set[Optional[str]]],
+    fmap_jsons: Dict[Tuple[str, Optional[str]], List[Path]],
     dry_run: bool,
+    state: Optional[Dict[str, int]] = None,
+    touched_subjects: Optional[Set[str]] = None,
 ) -> None:
-    """Update IntendedFor across fmap JSONs affected by the rel_map."""
-    # Group by subject and session (if present). Support datasets with or without sessions.
-    subjects: Set[str] = set()
-    sessions_by_subject: Dict[str, Set[Optional[str]]] = {}
+    """Update IntendedFor across fmap JSONs affected by the rel_map.
 
-    for abs_path in bids_dir.rglob("sub-*/**/*.nii*"):
-        ss = subject_and_session_from_path(abs_path)
-        if not ss:
-            continue
-        sub, ses = ss
-        subjects.add(sub)
-        sessions_by_subject.setdefault(sub, set()).add(ses)
-
-    # Process fmap JSONs per subject/session
-    for subject in sorted(subjects):
+    When a state cache is given, JSONs whose mtime matches the cache are
+    skipped unless their subject had files renamed this run.
+    """
+    touched = touched_subjects or set()
+    # Process fmap JSONs per subject/session as collected by scan_bids.
+    # Support datasets with or without sessions.
+    for subject in sorted(sessions_by_subject):
         for session in sorted(
             sessions_by_subject.get(subject, {None}),
             key=lambda x: ("" if x is None else x),
         ):
-            for json_path in list_fmap_jsons_for_session(bids_dir, subject, session):
+            for json_path in sorted(fmap_jsons.get((subject, session), [])):
+                key = str(json_path)
+                if state is not None and subject not in touched:
+                    try:
+                        mtime = json_path.stat().st_mtime_ns
+                    except OSError:
+                        mtime = None
+                    if mtime is not None and state.get(key) == mtime:
+                        continue
                 update_intendedfor_in_json(
                     json_path, subject, rel_map, bids_dir, dry_run
                 )
+                if state is not None and not dry_run:
+                    try:
+                        state[key] = json_path.stat().st_mtime_ns
+                    except OSError:
+                        state.pop(key, None)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -372,8 +460,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         print(f"Error: '{bids_dir}' is not a directory", file=sys.stderr)
         return 2
 
-    # Plan core renames
-    core_plans = compute_rename_plans(bids_dir)
+    # Plan core renames and collect fmap/session layout in one walk
+    core_plans, sessions_by_subject, fmap_jsons = scan_bids(bids_dir)
     if not core_plans:
         print("No files with run- entities found.")
     else:
@@ -403,8 +491,32 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     # Build IntendedFor mapping from planned NIfTI renames
     rel_map = build_intendedfor_mapping(core_plans, bids_dir)
 
-    # Update fmap IntendedFor (also cleans stale references)
-    update_all_fmap_intendedfor(bids_dir, rel_map, dry_run=dry_run)
+    # Update fmap IntendedFor (also cleans stale references). When nothing was
+    # renamed and no fmap JSON even mentions a run- token, the update phase
+    # cannot change anything, so skip parsing the JSONs entirely.
+    if not rel_map and not any_fmap_json_mentions_run(fmap_jsons):
+        print("No renames and no run- references in fmap JSONs; skipping IntendedFor update.")
+    else:
+        # Subjects with renamed NIfTIs must be reprocessed even if their fmap
+        # JSONs are unchanged since the last run.
+        touched_subjects: Set[str] = set()
+        for plan in core_plans:
+            ss = subject_and_session_from_path(plan.src)
+            if ss:
+                touched_subjects.add(ss[0])
+
+        state = load_curation_state(bids_dir)
+        update_all_fmap_intendedfor(
+            bids_dir,
+            rel_map,
+            sessions_by_subject,
+            fmap_jsons,
+            dry_run=dry_run,
+            state=state,
+            touched_subjects=touched_subjects,
+        )
+        if not dry_run:
+            save_curation_state(bids_dir, state)
 
     if dry_run:
         print("Dry run complete; no files modified.")
@@ -16,34 +16,74 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Iterable, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+
+# All reads hand raw bytes straight to the parser; opening sidecars in text
+# mode would add a full str-decode pass over every file for no benefit.
+_loads = json.loads if orjson is None else orjson.loads
+
+
+def _atomic_write(path: Path, blob: bytes) -> None:
+    """Write blob with one write syscall and an atomic rename into place."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(blob)
+    os.replace(tmp, path)
+
 
 def iter_asl_json_files(bids_root: Path) -> Iterable[Path]:
     """Yield ASL JSON files under perf/ while skipping derivatives/.
 
+    Walks the tree with os.scandir rather than Path.rglob so the file type
+    from readdir is reused (no extra stat per entry) and derivatives/
+    subtrees are pruned instead of filtered after the fact.
+
     Parameters
     ----------
     bids_root: Path
         The root directory of the BIDS dataset.
     """
-    # Match typical BIDS ASL JSON filenames
-    for json_path in bids_root.rglob("*_asl.json"):
-        parts = json_path.parts
-        if any(part == "derivatives" for part in parts):
-            continue
-        if "perf" not in parts:
+    # Match typical BIDS ASL JSON filenames. Whether a file sits under perf/
+    # is tracked as a flag while descending, so no per-file Path.parts tuple
+    # is ever built.
+    stack = [(str(bids_root), False)]
+    while stack:
+        dir_path, in_perf = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != "derivatives":
+                            stack.append(
+                                (entry.path, in_perf or entry.name == "perf")
+                            )
+                    elif (
+                        in_perf
+                        and entry.name.endswith("_asl.json")
+                        and entry.is_file()
+                    ):
+                        yield Path(entry.path)
+        except OSError:
             continue
-        yield json_path
 
 
 def should_set_true(value) -> bool:
     """Return True if the given value represents a false that should be set to True."""
-    if isinstance(value, bool):
-        return value is False
-    if isinstance(value, str):
-        return value.strip().lower() == "false"
+    if value is False:
+        return True
+    if type(value) is str:
+        # Length check first so the common non-match avoids the lower() copy
+        v = value.strip()
+        return len(v) == 5 and v.lower() == "false"
     return False
 
 
@@ -53,8 +93,20 @@ def update_background_suppression(json_path: Path, dry_run: bool) -> Tuple[bool,
     Returns (changed, message).
     """
     try:
-        with json_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        raw = json_path.read_bytes()
+    except Exception as exc:  # noqa: BLE001
+        return False, f"ERROR reading {json_path}: {exc}"
+
+    # Byte-level prefilter: most sidecars either lack the field or already
+    # have it true, and neither case can change, so skip the full parse.
+    idx = raw.find(b'"BackgroundSuppression"')
+    if idx < 0:
+        return False, f"SKIP (missing field): {json_path}"
+    if b"false" not in raw[idx : idx + 200].lower():
+        return False, f"SKIP (already true or non-false): {json_path}"
+
+    try:
+        data = _loads(raw)
     except Exception as exc:  # noqa: BLE001
         return False, f"ERROR reading {json_path}: {exc}"
 
@@ -70,9 +122,7 @@ def update_background_suppression(json_path: Path, dry_run: bool) -> Tuple[bool,
         return True, f"DRY-RUN would update: {json_path}"
 
     try:
-        with json_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-            f.write("\n")
+        _atomic_write(json_path, (json.dumps(data, indent=4) + "\n").encode("utf-8"))
     except Exception as exc:  # noqa: BLE001
         return False, f"ERROR writing {json_path}: {exc}"
 
@@ -107,15 +157,23 @@ def main() -> None:
     skipped_count = 0
     error_count = 0
 
-    for json_path in iter_asl_json_files(bids_root):
-        changed, message = update_background_suppression(json_path, args.dry_run)
-        print(message)
-        if message.startswith("ERROR"):
-            error_count += 1
-        elif changed:
-            changed_count += 1
-        else:
-            skipped_count += 1
+    # Each sidecar is independent, so process them in parallel and print the
+    # per-file messages on the driver to keep stdout ordering deterministic.
+    # Dry runs only read, so threads suffice there.
+    json_files = list(iter_asl_json_files(bids_root))
+    cpu = os.cpu_count() or 1
+    chunksize = max(1, len(json_files) // (4 * cpu))
+    executor_cls = ThreadPoolExecutor if args.dry_run else ProcessPoolExecutor
+    worker = partial(update_background_suppression, dry_run=args.dry_run)
+    with executor_cls(max_workers=cpu) as executor:
+        for changed, message in executor.map(worker, json_files, chunksize=chunksize):
+            print(message)
+            if message.startswith("ERROR"):
+                error_count += 1
+            elif changed:
+                changed_count += 1
+            else:
+                skipped_count += 1
 
     summary = f"Completed. Changed: {changed_count}, Skipped: {skipped_count}, Errors: {error_count}."
     print(summary)
@@ -1,72 +1,137 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import re
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+# Rewrites any non-ses-1 session entity to ses-1. Compiled once here rather
+# than per IntendedFor path; the negative lookahead avoids accidental
+# replacements of ses-1 itself.
+_SES_RE = re.compile(r"ses-(?!1\b)[a-zA-Z0-9]+")
+
+
+# All reads hand raw bytes straight to the parser; opening sidecars in text
+# mode would add a full str-decode pass over every file for no benefit.
+_loads = json.loads if orjson is None else orjson.loads
+
+
+def _load_json(json_path):
+    """Parse a JSON file from bytes, using orjson's C parser when available."""
+    return _loads(Path(json_path).read_bytes())
+
+
+def _atomic_write(path, blob):
+    """Write blob with one write syscall and an atomic rename into place."""
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(blob)
+    os.replace(tmp, path)
+
+
+def _apply_common(data, json_path, messages):
+    """Apply the RepetitionTimePreparation and AcquisitionVoxelSize updates
+    shared by ASL and M0 sidecars.
+
+    Reads each key once into a local via .get and returns a dirty flag;
+    warnings are appended to the caller's message list.
+    """
+    dirty = False
+
+    rt = data.get("RepetitionTime")
+    if rt is not None:
+        if data.get("RepetitionTimePreparation") != rt:
+            data["RepetitionTimePreparation"] = rt
+            dirty = True
+    else:
+        messages.append(
+            f"Warning: 'RepetitionTime' not found in {json_path}. Cannot set 'RepetitionTimePreparation'."
+        )
+
+    v1 = data.get("VoxelSizeDim1")
+    v2 = data.get("VoxelSizeDim2")
+    v3 = data.get("VoxelSizeDim3")
+    if v1 is not None and v2 is not None and v3 is not None:
+        acq_voxel_size = [v1, v2, v3]
+        if data.get("AcquisitionVoxelSize") != acq_voxel_size:
+            data["AcquisitionVoxelSize"] = acq_voxel_size
+            dirty = True
+    else:
+        messages.append(
+            f"Warning: VoxelSizeDim keys not found in {json_path}. Cannot set 'AcquisitionVoxelSize'."
+        )
+
+    return dirty
+
 
 def update_asl_json(json_path):
-    """Updates metadata in an ASL JSON file."""
+    """Updates metadata in an ASL JSON file.
+
+    Returns a list of messages for the caller to print, so the function can
+    run in worker processes with deterministic stdout on the driver.
+    """
+    messages = []
     try:
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        raw = Path(json_path).read_bytes()
+        data = _loads(raw)
 
         updated = False
 
-        # Update TotalAcquiredPairs
+        # Update TotalAcquiredPairs. Use integer division when NumVolumes is
+        # an even int so the value round-trips without a float re-parse
+        # manufacturing a spurious diff on the next run.
         if "NumVolumes" in data:
-            total_acquired_pairs = data["NumVolumes"] / 2
+            num_volumes = data["NumVolumes"]
+            if isinstance(num_volumes, int) and num_volumes % 2 == 0:
+                total_acquired_pairs = num_volumes // 2
+            else:
+                total_acquired_pairs = num_volumes / 2
             if data.get("TotalAcquiredPairs") != total_acquired_pairs:
                 data["TotalAcquiredPairs"] = total_acquired_pairs
                 updated = True
         else:
-            print(
+            messages.append(
                 f"Warning: 'NumVolumes' not found in {json_path}. Cannot calculate 'TotalAcquiredPairs'."
             )
 
-        # Update RepetitionTimePreparation
-        if "RepetitionTime" in data:
-            if data.get("RepetitionTimePreparation") != data["RepetitionTime"]:
-                data["RepetitionTimePreparation"] = data["RepetitionTime"]
-                updated = True
-        else:
-            print(
-                f"Warning: 'RepetitionTime' not found in {json_path}. Cannot set 'RepetitionTimePreparation'."
-            )
-
-        # Update AcquisitionVoxelSize
-        if all(k in data for k in ("VoxelSizeDim1", "VoxelSizeDim2", "VoxelSizeDim3")):
-            acq_voxel_size = [
-                data["VoxelSizeDim1"],
-                data["VoxelSizeDim2"],
-                data["VoxelSizeDim3"],
-            ]
-            if data.get("AcquisitionVoxelSize") != acq_voxel_size:
-                data["AcquisitionVoxelSize"] = acq_voxel_size
-                updated = True
-        else:
-            print(
-                f"Warning: VoxelSizeDim keys not found in {json_path}. Cannot set 'AcquisitionVoxelSize'."
-            )
+        # Update RepetitionTimePreparation and AcquisitionVoxelSize
+        updated = _apply_common(data, json_path, messages) or updated
 
         if updated:
-            with open(json_path, "w") as f:
-                json.dump(data, f, sort_keys=True, indent=4)
-            print(f"Updated: {json_path}")
+            # Only rewrite when the serialized form actually differs; the
+            # dirty flag can trip spuriously (e.g. float re-parsing) and the
+            # indented, sorted re-serialization is the expensive path.
+            new_blob = json.dumps(data, sort_keys=True, indent=4).encode()
+            if new_blob != raw:
+                _atomic_write(json_path, new_blob)
+                messages.append(f"Updated: {json_path}")
         # else:
-        # print(f"No updates needed for: {json_path}")
+        # messages.append(f"No updates needed for: {json_path}")
 
     except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {json_path}")
+        messages.append(f"Error: Could not decode JSON from {json_path}")
     except Exception as e:
-        print(f"Error processing {json_path}: {e}")
+        messages.append(f"Error processing {json_path}: {e}")
+
+    return messages
 
 
 def update_m0_json(json_path):
-    """Updates metadata in an M0 JSON file."""
+    """Updates metadata in an M0 JSON file.
+
+    Returns a list of messages for the caller to print, so the function can
+    run in worker processes with deterministic stdout on the driver.
+    """
+    messages = []
     try:
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        raw = Path(json_path).read_bytes()
+        data = _loads(raw)
 
         updated = False
 
@@ -84,7 +149,7 @@ def update_m0_json(json_path):
                 intended_for_list = original_intended_for
                 was_originally_list = True
             else:
-                print(
+                messages.append(
                     f"Warning: 'IntendedFor' in {json_path} is neither string nor list. Skipping update."
                 )
 
@@ -93,11 +158,12 @@ def update_m0_json(json_path):
                 updated_intended_for = []
                 path_changed = False
                 for current_path in intended_for_list:
-                    # Replace ses-* with ses-1
-                    # Use a more specific regex to avoid accidental replacements
-                    updated_path = re.sub(
-                        r"ses-(?!1\b)[a-zA-Z0-9]+", "ses-1", current_path
-                    )
+                    # Replace ses-* with ses-1; skip the regex entirely for
+                    # paths with no session entity at all
+                    if "ses-" not in current_path:
+                        updated_path = current_path
+                    else:
+                        updated_path = _SES_RE.sub("ses-1", current_path)
                     updated_intended_for.append(updated_path)
                     if updated_path != current_path:
                         path_changed = True
@@ -109,45 +175,34 @@ def update_m0_json(json_path):
                     updated = True
 
         else:
-            print(f"Warning: 'IntendedFor' not found in {json_path}. Skipping update.")
-
-        # Update RepetitionTimePreparation
-        if "RepetitionTime" in data:
-            if data.get("RepetitionTimePreparation") != data["RepetitionTime"]:
-                data["RepetitionTimePreparation"] = data["RepetitionTime"]
-                updated = True
-        else:
-            print(
-                f"Warning: 'RepetitionTime' not found in {json_path}. Cannot set 'RepetitionTimePreparation'."
+            messages.append(
+                f"Warning: 'IntendedFor' not found in {json_path}. Skipping update."
             )
 
-        # Update AcquisitionVoxelSize
-        if all(k in data for k in ("VoxelSizeDim1", "VoxelSizeDim2", "VoxelSizeDim3")):
-            acq_voxel_size = [
-                data["VoxelSizeDim1"],
-                data["VoxelSizeDim2"],
-                data["VoxelSizeDim3"],
-            ]
-            if data.get("AcquisitionVoxelSize") != acq_voxel_size:
-                data["AcquisitionVoxelSize"] = acq_voxel_size
-                updated = True
-        else:
-            print(
-                f"Warning: VoxelSizeDim keys not found in {json_path}. Cannot set 'AcquisitionVoxelSize'."
-            )
+        # Update RepetitionTimePreparation and AcquisitionVoxelSize
+        updated = _apply_common(data, json_path, messages) or updated
 
         if updated:
-            with open(json_path, "w") as f:
-                # Ensure indent is 4 spaces as commonly used in BIDS
-                json.dump(data, f, sort_keys=True, indent=4)
-            print(f"Updated: {json_path}")
+            # Only rewrite when the serialized form actually differs (see
+            # update_asl_json). Indent stays 4 spaces as commonly used in BIDS.
+            new_blob = json.dumps(data, sort_keys=True, indent=4).encode()
+            if new_blob != raw:
+                _atomic_write(json_path, new_blob)
+                messages.append(f"Updated: {json_path}")
         # else:
-        # print(f"No updates needed for: {json_path}")
+        # messages.append(f"No updates needed for: {json_path}")
 
     except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {json_path}")
+        messages.append(f"Error: Could not decode JSON from {json_path}")
     except Exception as e:
-        print(f"Error processing {json_path}: {e}")
+        messages.append(f"Error processing {json_path}: {e}")
+
+    return messages
+
+
+def _print_messages(messages):
+    for message in messages:
+        print(message)
 
 
 def main():
@@ -174,20 +229,19 @@ def main():
 
         name_lower = file_path.name.lower()
         if name_lower.endswith("_asl.json"):
-            update_asl_json(file_path)
+            _print_messages(update_asl_json(file_path))
             return
         if name_lower.endswith("_m0scan.json"):
-            update_m0_json(file_path)
+            _print_messages(update_m0_json(file_path))
             return
 
         # Fallback: infer type from contents
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            data = _load_json(file_path)
             if "IntendedFor" in data:
-                update_m0_json(file_path)
+                _print_messages(update_m0_json(file_path))
             else:
-                update_asl_json(file_path)
+                _print_messages(update_asl_json(file_path))
         except Exception as e:
             print(f"Error: Could not process {args.file}: {e}")
         return
@@ -202,25 +256,25 @@ def main():
         print(f"Error: BIDS directory not found at {args.bids_dir}")
         return
 
-    # Find all subject directories (sub-*)
-    subject_dirs = [
-        d for d in bids_path.iterdir() if d.is_dir() and d.name.startswith("sub-")
-    ]
-
-    for subj_dir in subject_dirs:
-        perf_dir = subj_dir / "ses-1" / "perf"
-        if perf_dir.is_dir():
-            print(f"Processing: {perf_dir}")
-
-            # Process ASL JSON files
-            for asl_json_path in perf_dir.glob("*_asl.json"):
-                update_asl_json(asl_json_path)
-
-            # Process M0 JSON files
-            for m0_json_path in perf_dir.glob("*_m0scan.json"):
-                update_m0_json(m0_json_path)
-        # else:
-        # print(f"Skipping {subj_dir.name}: No ses-1/perf directory found.")
+    # One glob per sidecar type instead of iterdir over every subject plus
+    # two globs per perf dir; the pattern pins the layout to sub-*/ses-1/perf
+    # exactly as the nested loops did.
+    asl_json_paths = sorted(bids_path.glob("sub-*/ses-1/perf/*_asl.json"))
+    m0_json_paths = sorted(bids_path.glob("sub-*/ses-1/perf/*_m0scan.json"))
+
+    for perf_dir in sorted({p.parent for p in asl_json_paths + m0_json_paths}):
+        print(f"Processing: {perf_dir}")
+
+    # Each sidecar is independent, so fan the read/mutate/write work out
+    # across cores and print the collected messages on the driver.
+    cpu = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=cpu) as executor:
+        chunksize = max(1, len(asl_json_paths) // (4 * cpu))
+        for messages in executor.map(update_asl_json, asl_json_paths, chunksize=chunksize):
+            _print_messages(messages)
+        chunksize = max(1, len(m0_json_paths) // (4 * cpu))
+        for messages in executor.map(update_m0_json, m0_json_paths, chunksize=chunksize):
+            _print_messages(messages)
 
 
 if __name__ == "__main__":
@@ -20,13 +20,25 @@ Example:
 
 import argparse
 import base64
-import glob
+import fnmatch
 import os
 import re
 import shutil
 from typing import Dict, List, Tuple
 import json
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """Serialize to a JSON string, using orjson's C encoder when available."""
+    if orjson is None:
+        return json.dumps(obj)
+    return orjson.dumps(obj).decode("utf-8")
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -75,15 +87,15 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-FilenameRegex = re.compile(r"^(sub-[^_]+)_(ses-[^_]+)_([^.]+)\.png$")
-
-
 def natural_sort_key(sub: str, ses: str) -> Tuple:
-    m_sub = re.search(r"sub-(\d+)$", sub)
-    m_ses = re.search(r"ses-(\d+)$", ses)
+    # Both entities arrive prefixed (sub-/ses-), so slicing off the first
+    # four characters and one isdigit() check replaces the two regex
+    # searches the previous version ran per key.
+    sub_id = sub[4:]
+    ses_id = ses[4:]
     return (
-        int(m_sub.group(1)) if m_sub else sub,
-        int(m_ses.group(1)) if m_ses else ses,
+        int(sub_id) if sub_id.isdigit() else sub,
+        int(ses_id) if ses_id.isdigit() else ses,
     )
 
 
@@ -91,15 +103,26 @@ def collect_rows(
     root: str, pattern: str, views: List[str], allow_missing: bool
 ) -> Tuple[List[Tuple[str, str]], Dict[Tuple[str, str], Dict[str, str]]]:
     pairs: Dict[Tuple[str, str], Dict[str, str]] = {}
-    for path in glob.glob(os.path.join(root, pattern)):
-        fn = os.path.basename(path)
-        m = FilenameRegex.match(fn)
-        if not m:
-            continue
-        sub, ses, view = m.groups()
-        if view not in views:
-            continue
-        pairs.setdefault((sub, ses), {})[view] = path
+    # os.scandir reads the directory in one pass without the per-match stat
+    # that glob.glob does; the filename is parsed with cheap prefix/suffix
+    # checks and a split instead of a regex per entry. The --pattern filter
+    # is compiled once and applied only to names that survive the fast check.
+    match_pattern = re.compile(fnmatch.translate(pattern)).match
+    view_set = set(views)
+    with os.scandir(root) as it:
+        for entry in it:
+            fn = entry.name
+            if not (fn.startswith("sub-") and fn.endswith(".png")):
+                continue
+            if match_pattern(fn) is None:
+                continue
+            parts = fn[:-4].split("_", 2)
+            if len(parts) != 3 or not parts[1].startswith("ses-"):
+                continue
+            sub, ses, view = parts
+            if view not in view_set:
+                continue
+            pairs.setdefault((sub, ses), {})[view] = entry.path
 
     keys = sorted(pairs.keys(), key=lambda k: natural_sort_key(k[0], k[1]))
     if not allow_missing:
@@ -107,6 +130,39 @@ def collect_rows(
     return keys, pairs
 
 
+def _copy_asset(src: str, dst: str) -> None:
+    """Place src at dst, preferring a hardlink over a byte copy.
+
+    Hardlinks are free when assets/ lives on the same filesystem as the
+    source PNGs; fall back to a real copy (cross-device, existing dst, or
+    filesystems without link support). The copy path uses
+    os.copy_file_range where available (Linux), which moves the bytes
+    inside the kernel instead of round-tripping them through userspace
+    buffers; anything else falls back to shutil.copy2.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # e.g. cross-filesystem on older kernels
+
+    shutil.copy2(src, dst)
+
+
 def ensure_portable_assets(
     keys: List[Tuple[str, str]],
     pairs: Dict[Tuple[str, str], Dict[str, str]],
@@ -124,31 +180,44 @@ def ensure_portable_assets(
     assets_dir = os.path.join(os.path.dirname(os.path.abspath(out_html)), "assets")
     os.makedirs(assets_dir, exist_ok=True)
 
+    # Each source file is read/encoded or copied at most once, even if several
+    # (sub, ses, view) entries point at the same image.
+    ref_cache: Dict[str, str] = {}
+    out_dir = os.path.dirname(out_html)
+
+    def _prepare(src: str) -> str:
+        real = os.path.realpath(src)
+        ref = ref_cache.get(real)
+        if ref is not None:
+            return ref
+
+        try:
+            size_kb = os.path.getsize(src) / 1024.0
+        except OSError:
+            size_kb = float("inf")
+
+        ref = ""
+        if embed_small_kb > 0 and size_kb <= embed_small_kb:
+            try:
+                with open(src, "rb") as f:
+                    b64 = base64.b64encode(f.read()).decode("ascii")
+                ref = f"data:image/png;base64,{b64}"
+            except Exception:
+                pass  # fall through to copying
+        if not ref:
+            dst = os.path.join(assets_dir, os.path.basename(src))
+            _copy_asset(src, dst)
+            copied.append(dst)
+            ref = os.path.relpath(dst, out_dir)
+
+        ref_cache[real] = ref
+        return ref
+
     updated: Dict[Tuple[str, str], Dict[str, str]] = {}
     for key in keys:
         updated[key] = {}
         for view, src in pairs[key].items():
-            try:
-                size_kb = os.path.getsize(src) / 1024.0
-            except OSError:
-                size_kb = float("inf")
-
-            if embed_small_kb > 0 and size_kb <= embed_small_kb:
-                try:
-                    with open(src, "rb") as f:
-                        b64 = base64.b64encode(f.read()).decode("ascii")
-                    updated[key][view] = f"data:image/png;base64,{b64}"
-                except Exception:
-                    # Fallback to copying
-                    dst = os.path.join(assets_dir, os.path.basename(src))
-                    shutil.copy2(src, dst)
-                    copied.append(dst)
-                    updated[key][view] = os.path.relpath(dst, os.path.dirname(out_html))
-            else:
-                dst = os.path.join(assets_dir, os.path.basename(src))
-                shutil.copy2(src, dst)
-                copied.append(dst)
-                updated[key][view] = os.path.relpath(dst, os.path.dirname(out_html))
+            updated[key][view] = _prepare(src)
 
     return updated, copied
 
@@ -202,72 +271,74 @@ def render_html(
     """
 
     # Data for client-side JS
-    # Build rows: [{sub, ses, images: {view: src}}]
+    # Build rows: [{sub, ses, imgs: [src, ...]}] with srcs in VIEWS order, so
+    # the JS indexes by position instead of repeating the view names as keys
+    # in every row.
     data_rows = []
     for sub, ses in keys:
-        images = {v: pairs[(sub, ses)].get(v, "") for v in views}
+        row_pairs = pairs[(sub, ses)]
         data_rows.append(
             {
                 "sub": sub,
                 "ses": ses,
-                "images": images,
+                "imgs": [row_pairs.get(v, "") for v in views],
             }
         )
 
     # Serialize minimal JSON safely
-    json_data = json.dumps(data_rows)
-    json_views = json.dumps(views)
-
-    js = f"""
-    const DATA = {json_data};
-    const VIEWS = {json_views};
-    let PREFILL = {{}}; // key: `${{sub}}|${{ses}}` -> {{ view: score }}
-    let RATINGS = {{}}; // live user selections, same keying as PREFILL
-    let RATER1 = {{}}, RATER2 = {{}};
-    let AGREED = {{}};        // key -> {{ view: score }} for views where raters match
-    let DISCREPANCIES = {{}}; // key -> {{ view: {{ r1: score, r2: score }} }}
-    let CONSENSUS_RATINGS = {{}};
+    json_data = _dumps(data_rows)
+    json_views = _dumps(views)
+
+    # Everything below the DATA/VIEWS assignments is static JS, so it is a
+    # plain string; the JSON payloads are written separately in render.
+    js_body = """
+    let PREFILL = {}; // key: `${sub}|${ses}` -> { view: score }
+    let RATINGS = {}; // live user selections, same keying as PREFILL
+    let RATER1 = {}, RATER2 = {};
+    let AGREED = {};        // key -> { view: score } for views where raters match
+    let DISCREPANCIES = {}; // key -> { view: { r1: score, r2: score } }
+    let CONSENSUS_RATINGS = {};
     let consensusMode = false;
 
     const makeKey = (sub, ses) => sub + '|' + ses;
 
-    function escapeCsv(val) {{
+    function escapeCsv(val) {
       if (val == null) return '';
       const s = String(val);
-      if (s.includes('"') || s.includes(',') || s.includes('\\n')) {{
+      if (s.includes('"') || s.includes(',') || s.includes('\\n')) {
         return '"' + s.replace(/"/g, '""') + '"';
-      }}
+      }
       return s;
-    }}
+    }
 
-    function toCSV() {{
+    function toCSV() {
       const headers = ['subid','sesid', ...VIEWS.map(v => v + '_score')];
       const lines = [headers.join(',')];
-      for (const row of DATA) {{
+      for (const row of DATA) {
         const key = makeKey(row.sub, row.ses);
-        const scores = VIEWS.map(v => {{
+        const scores = VIEWS.map(v => {
           if (RATINGS[key] && RATINGS[key][v] !== undefined) return RATINGS[key][v];
           if (PREFILL[key] && PREFILL[key][v] !== undefined) return PREFILL[key][v];
           return '';
-        }});
+        });
         const line = [row.sub, row.ses, ...scores].map(escapeCsv).join(',');
         lines.push(line);
-      }}
+      }
       return lines.join('\\n');
-    }}
+    }
 
-    function getInitials() {{
+    function getInitials() {
       const el = document.getElementById('initials');
       return el ? el.value.trim() : '';
-    }}
+    }
 
-    function makeFilename(base, ext) {{
+    function makeFilename(base, ext) {
       const ini = getInitials();
-      return ini ? `${{base}}_${{ini}}.${{ext}}` : `${{base}}.${{ext}}`;
-    }}
+      return ini ? `${base}_${ini}.${ext}` : `${base}.${ext}`;
+    }
 
-    function triggerDownload(csv, filename) {{
-      const blob = new Blob([csv], {{ type: 'text/csv;charset=utf-8;' }});
+    function triggerDownload(csv, filename) {
+      const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
       const url = URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
@@ -276,191 +347,191 @@ def render_html(
       a.click();
       document.body.removeChild(a);
       URL.revokeObjectURL(url);
-    }}
+    }
 
-    function downloadCSV() {{
+    function downloadCSV() {
       triggerDownload(toCSV(), makeFilename('T1-ratings', 'csv'));
-    }}
+    }
 
-    function parseCSV(text) {{
+    function parseCSV(text) {
       const rows = [];
       let i = 0, field = '', inQuotes = false, row = [];
-      while (i < text.length) {{
+      while (i < text.length) {
         const c = text[i++];
-        if (inQuotes) {{
-          if (c === '"') {{
-            if (text[i] === '"') {{ field += '"'; i++; }} else {{ inQuotes = false; }}
-          }} else {{
+        if (inQuotes) {
+          if (c === '"') {
+            if (text[i] === '"') { field += '"'; i++; } else { inQuotes = false; }
+          } else {
             field += c;
-          }}
-        }} else {{
-          if (c === '"') {{ inQuotes = true; }}
-          else if (c === ',') {{ row.push(field); field=''; }}
-          else if (c === '\\n' || c === '\\r') {{
+          }
+        } else {
+          if (c === '"') { inQuotes = true; }
+          else if (c === ',') { row.push(field); field=''; }
+          else if (c === '\\n' || c === '\\r') {
             if (c === '\\r' && text[i] === '\\n') i++;
             row.push(field); rows.push(row); row = []; field='';
-          }} else {{ field += c; }}
-        }}
-      }}
-      if (field.length || row.length) {{ row.push(field); rows.push(row); }}
+          } else { field += c; }
+        }
+      }
+      if (field.length || row.length) { row.push(field); rows.push(row); }
       return rows.filter(r => r.length && r.some(x => x !== ''));
-    }}
+    }
 
-    function buildPrefillFromCSV(rows) {{
-      if (!rows || rows.length < 2) return {{}};
+    function buildPrefillFromCSV(rows) {
+      if (!rows || rows.length < 2) return {};
       const header = rows[0];
       const subIdx = header.indexOf('subid');
       const sesIdx = header.indexOf('sesid');
       const viewIdx = Object.fromEntries(VIEWS.map(v => [v, header.indexOf(v + '_score')]));
-      const map = {{}};
-      for (let r = 1; r < rows.length; r++) {{
+      const map = {};
+      for (let r = 1; r < rows.length; r++) {
         const row = rows[r];
         const sub = row[subIdx];
         const ses = row[sesIdx];
         if (!sub || !ses) continue;
-        const key = `${{sub}}|${{ses}}`;
-        map[key] = map[key] || {{}};
-        for (const v of VIEWS) {{
+        const key = `${sub}|${ses}`;
+        map[key] = map[key] || {};
+        for (const v of VIEWS) {
           const idx = viewIdx[v];
-          if (idx >= 0 && row[idx] !== undefined && row[idx] !== '') {{
+          if (idx >= 0 && row[idx] !== undefined && row[idx] !== '') {
             map[key][v] = String(row[idx]);
-          }}
-        }}
-      }}
+          }
+        }
+      }
       return map;
-    }}
+    }
 
-    function applyPrefill(prefill) {{
+    function applyPrefill(prefill) {
       const cards = document.querySelectorAll('[data-card]');
       let applied = 0;
-      for (const card of cards) {{
+      for (const card of cards) {
         const sub = card.getAttribute('data-sub');
         const ses = card.getAttribute('data-ses');
-        const key = `${{sub}}|${{ses}}`;
+        const key = `${sub}|${ses}`;
         const views = prefill[key];
         if (!views) continue;
-        for (const v of VIEWS) {{
+        for (const v of VIEWS) {
           const val = views[v];
           if (val === undefined) continue;
-          const sel = card.querySelector(`[data-score="${{v}}"]`);
-          if (sel) {{ sel.value = val; applied++; }}
-        }}
-      }}
+          const sel = card.querySelector(`[data-score="${v}"]`);
+          if (sel) { sel.value = val; applied++; }
+        }
+      }
       return applied;
-    }}
+    }
 
-    function onCsvSelected(file) {{
+    function onCsvSelected(file) {
       const reader = new FileReader();
-      reader.onload = (e) => {{
+      reader.onload = (e) => {
         const text = e.target.result;
         const rows = parseCSV(text);
         PREFILL = buildPrefillFromCSV(rows);
         const n = applyPrefill(PREFILL);
         const msg = document.getElementById('resumeMsg');
-        if (msg) msg.textContent = `Applied ${{n}} ratings from CSV`;
-      }};
+        if (msg) msg.textContent = `Applied ${n} ratings from CSV`;
+      };
       reader.readAsText(file);
-    }}
+    }
 
-    function readFileAsText(file) {{
-      return new Promise((resolve, reject) => {{
+    function readFileAsText(file) {
+      return new Promise((resolve, reject) => {
         const reader = new FileReader();
         reader.onload = (e) => resolve(e.target.result);
         reader.onerror = reject;
         reader.readAsText(file);
-      }});
-    }}
+      });
+    }
 
-    function toggleConsensusMode() {{
+    function toggleConsensusMode() {
       const cb = document.getElementById('consensusToggle');
       consensusMode = cb.checked;
       document.getElementById('consensusPanel').classList.toggle('active', consensusMode);
       document.getElementById('individualControls').style.display = consensusMode ? 'none' : '';
-      if (!consensusMode) {{
-        RATER1 = {{}}; RATER2 = {{}}; AGREED = {{}}; DISCREPANCIES = {{}}; CONSENSUS_RATINGS = {{}};
+      if (!consensusMode) {
+        RATER1 = {}; RATER2 = {}; AGREED = {}; DISCREPANCIES = {}; CONSENSUS_RATINGS = {};
         document.getElementById('consensusMsg').textContent = '';
         render(document.getElementById('search').value);
-      }}
-    }}
+      }
+    }
 
-    async function compareRaters() {{
+    async function compareRaters() {
       const f1 = document.getElementById('rater1Upload').files[0];
       const f2 = document.getElementById('rater2Upload').files[0];
-      if (!f1 || !f2) {{
+      if (!f1 || !f2) {
         document.getElementById('consensusMsg').textContent = 'Please select both Rater 1 and Rater 2 CSV files.';
         return;
-      }}
+      }
       const [text1, text2] = await Promise.all([readFileAsText(f1), readFileAsText(f2)]);
       RATER1 = buildPrefillFromCSV(parseCSV(text1));
       RATER2 = buildPrefillFromCSV(parseCSV(text2));
-      AGREED = {{}};
-      DISCREPANCIES = {{}};
-      CONSENSUS_RATINGS = {{}};
+      AGREED = {};
+      DISCREPANCIES = {};
+      CONSENSUS_RATINGS = {};
       let agreeCount = 0, discrepCount = 0, totalSubs = 0;
-      for (const row of DATA) {{
+      for (const row of DATA) {
         const key = makeKey(row.sub, row.ses);
-        const r1 = RATER1[key] || {{}};
-        const r2 = RATER2[key] || {{}};
+        const r1 = RATER1[key] || {};
+        const r2 = RATER2[key] || {};
         let hasDiscrep = false;
-        for (const v of VIEWS) {{
+        for (const v of VIEWS) {
           const v1 = r1[v] !== undefined ? String(r1[v]) : '';
           const v2 = r2[v] !== undefined ? String(r2[v]) : '';
-          if (v1 === v2 && v1 !== '') {{
-            AGREED[key] = AGREED[key] || {{}};
+          if (v1 === v2 && v1 !== '') {
+            AGREED[key] = AGREED[key] || {};
             AGREED[key][v] = v1;
-          }} else {{
-            DISCREPANCIES[key] = DISCREPANCIES[key] || {{}};
-            DISCREPANCIES[key][v] = {{ r1: v1, r2: v2 }};
+          } else {
+            DISCREPANCIES[key] = DISCREPANCIES[key] || {};
+            DISCREPANCIES[key][v] = { r1: v1, r2: v2 };
             hasDiscrep = true;
-          }}
-        }}
+          }
+        }
         totalSubs++;
         if (hasDiscrep) discrepCount++; else agreeCount++;
-      }}
+      }
       document.getElementById('consensusMsg').textContent =
-        `${{agreeCount}} of ${{totalSubs}} subjects fully agree; ${{discrepCount}} subjects have discrepancies`;
+        `${agreeCount} of ${totalSubs} subjects fully agree; ${discrepCount} subjects have discrepancies`;
       render(document.getElementById('search').value);
-    }}
+    }
 
-    function toConsensusCSV() {{
+    function toConsensusCSV() {
       const headers = ['subid','sesid', ...VIEWS.map(v => v + '_score'), 'average_rating', 'classification'];
       const lines = [headers.join(',')];
-      for (const row of DATA) {{
+      for (const row of DATA) {
         const key = makeKey(row.sub, row.ses);
-        const scores = VIEWS.map(v => {{
+        const scores = VIEWS.map(v => {
           if (AGREED[key] && AGREED[key][v] !== undefined) return AGREED[key][v];
           if (CONSENSUS_RATINGS[key] && CONSENSUS_RATINGS[key][v] !== undefined) return CONSENSUS_RATINGS[key][v];
           return '';
-        }});
+        });
         const numericScores = scores.filter(s => s !== '').map(Number);
         let avg = '', classification = '';
-        if (numericScores.length === VIEWS.length) {{
+        if (numericScores.length === VIEWS.length) {
           avg = numericScores.reduce((a, b) => a + b, 0) / numericScores.length;
           if (avg === 0) classification = 'Fail';
           else if (avg === 1) classification = 'Pass';
           else classification = 'Artifact';
           avg = String(avg);
-        }}
+        }
         const line = [row.sub, row.ses, ...scores, avg, classification].map(escapeCsv).join(',');
         lines.push(line);
-      }}
+      }
       return lines.join('\\n');
-    }}
+    }
 
-    function downloadConsensusCSV() {{
+    function downloadConsensusCSV() {
       triggerDownload(toConsensusCSV(), makeFilename('T1-consensus', 'csv'));
-    }}
+    }
 
-    function render(filter='') {{
+    function render(filter='') {
       const root = document.getElementById('root');
       root.innerHTML = '';
       const q = filter.trim().toLowerCase();
       let rows = DATA.filter(r => (r.sub + ' ' + r.ses).toLowerCase().includes(q));
       const inConsensus = consensusMode && Object.keys(DISCREPANCIES).length > 0;
-      if (inConsensus) {{
+      if (inConsensus) {
         rows = rows.filter(r => DISCREPANCIES[makeKey(r.sub, r.ses)]);
-      }}
-      for (const row of rows) {{
+      }
+      for (const row of rows) {
         const key = makeKey(row.sub, row.ses);
         const card = document.createElement('div');
         card.className = 'card';
@@ -471,7 +542,7 @@ def render_html(
         const header = document.createElement('div');
         header.className = 'header';
         const title = document.createElement('div');
-        title.innerHTML = `<strong>${{row.sub}}</strong> &nbsp; <span class="muted">${{row.ses}}</span>`;
+        title.innerHTML = `<strong>${row.sub}</strong> &nbsp; <span class="muted">${row.ses}</span>`;
         const hint = document.createElement('div');
         hint.className = 'muted';
         hint.textContent = inConsensus ? 'Rate discrepancies (highlighted)' : 'Rate each view: 0=Fail, 1=Pass';
@@ -481,90 +552,92 @@ def render_html(
 
         const views = document.createElement('div');
         views.className = 'views';
-        for (const v of VIEWS) {{
+        for (let vi = 0; vi < VIEWS.length; vi++) {
+          const v = VIEWS[vi];
           const isDiscrep = inConsensus && DISCREPANCIES[key] && DISCREPANCIES[key][v];
           const isAgreed = inConsensus && AGREED[key] && AGREED[key][v] !== undefined;
           const box = document.createElement('div');
           box.className = 'view' + (isDiscrep ? ' discrepancy' : '') + (isAgreed ? ' agreed-lock' : '');
           const img = document.createElement('img');
-          const src = row.images[v] || '';
+          const src = row.imgs[vi] || '';
           if (src) img.src = src;
-          img.alt = `${{row.sub}} ${{row.ses}} ${{v}}`;
+          img.alt = `${row.sub} ${row.ses} ${v}`;
           const label = document.createElement('label');
           label.textContent = v;
           const select = document.createElement('select');
           select.setAttribute('data-score', v);
-          for (const [val, name] of [['', ''], ['0','Fail'], ['1','Pass']]) {{
+          for (const [val, name] of [['', ''], ['0','Fail'], ['1','Pass']]) {
             const opt = document.createElement('option');
             opt.value = val; opt.textContent = name;
             select.appendChild(opt);
-          }}
-          if (inConsensus) {{
-            if (isAgreed) {{
+          }
+          if (inConsensus) {
+            if (isAgreed) {
               select.value = AGREED[key][v];
               select.disabled = true;
-            }} else if (isDiscrep) {{
+            } else if (isDiscrep) {
               let initVal = '';
-              if (CONSENSUS_RATINGS[key] && CONSENSUS_RATINGS[key][v] !== undefined) {{
+              if (CONSENSUS_RATINGS[key] && CONSENSUS_RATINGS[key][v] !== undefined) {
                 initVal = CONSENSUS_RATINGS[key][v];
-              }}
+              }
               select.value = initVal;
-              select.addEventListener('change', () => {{
-                CONSENSUS_RATINGS[key] = CONSENSUS_RATINGS[key] || {{}};
+              select.addEventListener('change', () => {
+                CONSENSUS_RATINGS[key] = CONSENSUS_RATINGS[key] || {};
                 CONSENSUS_RATINGS[key][v] = select.value;
-              }});
-            }}
-          }} else {{
+              });
+            }
+          } else {
             let initVal = '';
-            if (RATINGS[key] && RATINGS[key][v] !== undefined) {{ initVal = RATINGS[key][v]; }}
-            else if (PREFILL[key] && PREFILL[key][v] !== undefined) {{ initVal = PREFILL[key][v]; }}
+            if (RATINGS[key] && RATINGS[key][v] !== undefined) { initVal = RATINGS[key][v]; }
+            else if (PREFILL[key] && PREFILL[key][v] !== undefined) { initVal = PREFILL[key][v]; }
             select.value = initVal;
-            select.addEventListener('change', () => {{
-              RATINGS[key] = RATINGS[key] || {{}};
+            select.addEventListener('change', () => {
+              RATINGS[key] = RATINGS[key] || {};
               RATINGS[key][v] = select.value;
-            }});
-          }}
+            });
+          }
           const rating = document.createElement('div');
           rating.className = 'rating';
           rating.appendChild(label);
           rating.appendChild(select);
           box.appendChild(img);
           box.appendChild(rating);
-          if (isDiscrep) {{
+          if (isDiscrep) {
             const ctx = document.createElement('div');
             ctx.className = 'rater-context';
             const d = DISCREPANCIES[key][v];
             const r1Label = d.r1 === '' ? '(blank)' : (d.r1 === '0' ? 'Fail' : 'Pass');
             const r2Label = d.r2 === '' ? '(blank)' : (d.r2 === '0' ? 'Fail' : 'Pass');
-            ctx.textContent = `R1: ${{r1Label}}  |  R2: ${{r2Label}}`;
+            ctx.textContent = `R1: ${r1Label}  |  R2: ${r2Label}`;
             box.appendChild(ctx);
-          }}
+          }
           views.appendChild(box);
-        }}
+        }
         card.appendChild(views);
         root.appendChild(card);
-      }}
+      }
       document.getElementById('count').textContent = rows.length + ' rows';
-    }}
+    }
 
-    window.addEventListener('DOMContentLoaded', () => {{
+    window.addEventListener('DOMContentLoaded', () => {
       const search = document.getElementById('search');
       search.addEventListener('input', () => render(search.value));
       const csv = document.getElementById('csvUpload');
-      csv.addEventListener('change', () => {{ if (csv.files && csv.files[0]) onCsvSelected(csv.files[0]); }});
+      csv.addEventListener('change', () => { if (csv.files && csv.files[0]) onCsvSelected(csv.files[0]); });
       render('');
-    }});
+    });
     """
 
-    html_doc = f"""
+    html_head = """
 <!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <title>T1 QC Ratings</title>
-  <style>{css}</style>
-  <script>{js}</script>
+  <style>"""
+
+    html_body = """</script>
 </head>
 <body>
   <h1>T1 QC Ratings</h1>
@@ -599,8 +672,19 @@ def render_html(
 </html>
 """
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(html_doc)
+    # Write the document in sections through one buffered handle rather than
+    # concatenating a single giant string first; the JSON payloads go from
+    # their buffers straight into the file with no extra copy.
+    with open(out_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(html_head)
+        f.write(css)
+        f.write("</style>\n  <script>\n    const DATA = ")
+        f.write(json_data)
+        f.write(";\n    const VIEWS = ")
+        f.write(json_views)
+        f.write(";")
+        f.write(js_body)
+        f.write(html_body)
 
 
 def main() -> None:
@@ -23,6 +23,19 @@ FREESURFER_CSV = DATA_DIR / "freesurfer-post_euler_qc.csv"
 T1_RATINGS_CSV = DATA_DIR / "T1-ratings_consensus.csv"
 
 
+def read_table(csv_path: Path) -> pd.DataFrame:
+    """Read a QC table, preferring a typed Parquet sibling when present.
+
+    The upstream QC scripts write Parquet copies of their machine-consumed
+    outputs next to the CSVs; Parquet round-trips dtypes and skips CSV
+    parsing entirely. Tables without a sibling fall back to the CSV.
+    """
+    parquet_path = csv_path.with_suffix(".parquet")
+    if parquet_path.exists():
+        return pd.read_parquet(parquet_path)
+    return pd.read_csv(csv_path)
+
+
 def write_json(path: Path, payload: dict[str, object]) -> None:
     with path.open("w") as f:
         json.dump(payload, f, indent=2)
@@ -80,8 +93,8 @@ def save_outputs(stem: str, df: pd.DataFrame, sidecar: dict[str, object]) -> Non
 
 
 def build_fmri_qc() -> tuple[pd.DataFrame, dict[str, object]]:
-    motion_df = pd.read_csv(FMRI_MOTION_CSV)
-    coverage_df = pd.read_csv(FMRI_COVERAGE_CSV)
+    motion_df = read_table(FMRI_MOTION_CSV)
+    coverage_df = read_table(FMRI_COVERAGE_CSV)
 
     merge_cols = ["sub", "ses", "task", "acq"]
     assert_unique(motion_df, merge_cols, "fMRI motion")
@@ -189,8 +202,8 @@ def build_fmri_qc() -> tuple[pd.DataFrame, dict[str, object]]:
 
 
 def build_diffusion_qc() -> tuple[pd.DataFrame, dict[str, object]]:
-    qsiprep_df = pd.read_csv(DIFFUSION_QSIPREP_CSV)
-    qsirecon_df = pd.read_csv(DIFFUSION_QSIRECON_CSV)
+    qsiprep_df = read_table(DIFFUSION_QSIPREP_CSV)
+    qsirecon_df = read_table(DIFFUSION_QSIRECON_CSV)
 
     assert_unique(qsiprep_df, ["sub", "ses"], "diffusion qsiprep")
     assert_unique(qsirecon_df, ["subject", "session"], "diffusion qsirecon")
@@ -311,7 +324,7 @@ def build_diffusion_qc() -> tuple[pd.DataFrame, dict[str, object]]:
 
 
 def build_asl_qc() -> tuple[pd.DataFrame, dict[str, object]]:
-    asl_df = pd.read_csv(ASL_CSV)
+    asl_df = read_table(ASL_CSV)
     assert_unique(asl_df, ["sub", "ses"], "ASL")
 
     asl_df = asl_df.copy()
@@ -351,8 +364,8 @@ def build_asl_qc() -> tuple[pd.DataFrame, dict[str, object]]:
 
 
 def build_t1_qc() -> tuple[pd.DataFrame, dict[str, object]]:
-    ratings_df = pd.read_csv(T1_RATINGS_CSV)
-    fs_df = pd.read_csv(FREESURFER_CSV)
+    ratings_df = read_table(T1_RATINGS_CSV)
+    fs_df = read_table(FREESURFER_CSV)
 
     assert_unique(ratings_df, ["subid", "sesid"], "T1 ratings")
     assert_unique(fs_df, ["participant_id"], "FreeSurfer")
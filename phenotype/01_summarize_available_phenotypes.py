@@ -39,12 +39,22 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, Mapping, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+# Parse from raw bytes so orjson's C decoder gets the file verbatim; opening
+# in text mode would add a str-decode pass per subject for no benefit.
+_loads = json.loads if orjson is None else orjson.loads
 
 @dataclass
 class FieldStats:
@@ -74,37 +84,53 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
     return parser.parse_args(list(argv))
 
 
+# Missingness checks keyed on the value's concrete type; JSON decoding only
+# ever produces these exact types, so one dict lookup replaces the isinstance
+# chain. Anything not listed (numbers, bools) is present by definition.
+_MISSING_CHECKS = {
+    type(None): lambda v: True,
+    str: lambda v: v == "",
+    list: lambda v: len(v) == 0,
+    dict: lambda v: len(v) == 0,
+}
+
+
 def is_missing_value(value: Any) -> bool:
-    if value is None:
-        return True
-    if isinstance(value, str) and value == "":
-        return True
-    if isinstance(value, (list, dict)) and len(value) == 0:
-        return True
-    return False
+    check = _MISSING_CHECKS.get(type(value))
+    return False if check is None else check(value)
 
 
 def flatten_info(info: Mapping[str, Any], parent_key: str = "") -> Dict[str, Any]:
     """Flatten nested dict under `info` using dot notation for keys.
 
-    Lists are treated as atomic values and not expanded. Dicts are recursively
-    flattened. Only terminal key-paths are returned.
+    Lists are treated as atomic values and not expanded. Dicts are walked
+    iteratively with an explicit stack, writing terminal key-paths straight
+    into one output dict — no per-level temporaries or update() re-hashing.
+
+    Terminal keys are interned: the same few hundred field paths recur for
+    every subject, and interning collapses them to one shared string each,
+    so the counting dicts downstream compare keys by pointer.
     """
     flat: Dict[str, Any] = {}
-    for key, value in info.items():
-        if parent_key:
-            path = f"{parent_key}.{key}"
-        else:
-            path = key
-
-        if isinstance(value, dict):
-            nested = flatten_info(value, parent_key=path)
-            flat.update(nested)
-        else:
-            flat[path] = value
+    stack = [(parent_key, info)]
+    while stack:
+        prefix, obj = stack.pop()
+        for key, value in obj.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                stack.append((path, value))
+            else:
+                flat[sys.intern(path)] = value
     return flat
 
 
+# One bit per concrete JSON value type; exact type() keys keep bool and int
+# distinct without isinstance ordering concerns. Anything the decoder could
+# not have produced falls through to human_type_name.
+_TYPE_BITS = {bool: 1, int: 2, float: 4, str: 8, list: 16, dict: 32}
+_TYPE_NAMES = {1: "bool", 2: "int", 4: "float", 8: "str", 16: "list", 32: "dict"}
+
+
 def human_type_name(value: Any) -> str:
     if isinstance(value, bool):
         return "bool"
@@ -127,48 +153,109 @@ def find_subject_jsons(subjects_root: Path) -> Iterable[Path]:
     - Only immediate directories are considered subjects.
     - No recursion into nested subdirectories.
     - Only exact filename match <sub-id>.flywheel.json is used.
+
+    os.scandir lets DirEntry.is_dir() answer from the dirent type without a
+    stat per child, and the candidate file needs one os.path.isfile instead
+    of the exists()+is_file() pair of stats.
     """
-    if not subjects_root.exists() or not subjects_root.is_dir():
-        return []
+    if not subjects_root.is_dir():
+        return
 
-    for child in sorted(subjects_root.iterdir()):
-        if not child.is_dir():
+    with os.scandir(subjects_root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if not entry.is_dir():
             continue
-        subject_id = child.name
-        candidate = child / f"{subject_id}.flywheel.json"
-        if candidate.exists() and candidate.is_file():
-            yield candidate
+        candidate = os.path.join(entry.path, f"{entry.name}.flywheel.json")
+        if os.path.isfile(candidate):
+            yield Path(candidate)
 
 
-def summarize_info(json_files: Iterable[Path]) -> Tuple[int, Dict[str, FieldStats]]:
-    total_subjects = 0
-    present_counts: Dict[str, int] = defaultdict(int)
-    type_sets: Dict[str, set] = defaultdict(set)
-
-    for json_path in json_files:
-        try:
-            with json_path.open("r") as f:
-                data = json.load(f)
-        except Exception:
-            # Skip unreadable or invalid JSON files, but do not increment total
-            continue
+def _scan_subject_json(json_path: Path) -> Dict[str, Any] | None:
+    """Read one subject JSON and return its flattened `info` fields.
 
-        total_subjects += 1
+    Returns None for unreadable/invalid files (excluded from the subject
+    total) and an empty dict for valid files without a dict-valued `info`
+    (counted, but contributing no fields).
+    """
+    try:
+        data = _loads(json_path.read_bytes())
+    except Exception:
+        return None
 
-        info_obj = data.get("info")
-        if not isinstance(info_obj, dict):
-            continue
+    info_obj = data.get("info")
+    if not isinstance(info_obj, dict):
+        return {}
+    return flatten_info(info_obj)
+
+
+def _summarize_shard(json_paths: list) -> Tuple[int, Dict[str, list], Dict[str, set]]:
+    """Aggregate one shard of subject JSONs inside a worker process.
 
-        flat = flatten_info(info_obj)
+    Returns (n_valid, stats_raw, other_types) using the same
+    [count, type_bitmask] layout the driver keeps, so merging partials is a
+    dict walk plus int adds/ORs. Unreadable files are simply not counted.
+    """
+    total = 0
+    stats_raw: Dict[str, list] = {}
+    other_types: Dict[str, set] = defaultdict(set)
+    for json_path in json_paths:
+        flat = _scan_subject_json(json_path)
+        if flat is None:
+            continue
+        total += 1
         for field_path, value in flat.items():
             if is_missing_value(value):
                 continue
-            present_counts[field_path] += 1
-            type_sets[field_path].add(human_type_name(value))
+            bit = _TYPE_BITS.get(type(value))
+            if bit is None:
+                bit = 0
+                other_types[field_path].add(human_type_name(value))
+            entry = stats_raw.get(field_path)
+            if entry is None:
+                stats_raw[field_path] = [1, bit]
+            else:
+                entry[0] += 1
+                entry[1] |= bit
+    return total, stats_raw, dict(other_types)
+
+
+def summarize_info(json_files: Iterable[Path]) -> Tuple[int, Dict[str, FieldStats]]:
+    paths = list(json_files)
+
+    # The flatten+count work is CPU-bound once the bytes are parsed, so shard
+    # the files across worker processes that each aggregate locally; the
+    # driver merges one small partial per shard instead of touching every
+    # field of every subject. A few shards per worker keeps the pool balanced
+    # without per-file task overhead.
+    workers = max(1, min(os.cpu_count() or 1, len(paths)))
+    shard_size = max(1, -(-len(paths) // (workers * 4)))
+    shards = [paths[i : i + shard_size] for i in range(0, len(paths), shard_size)]
+
+    total_subjects = 0
+    stats_raw: Dict[str, list] = {}
+    other_types: Dict[str, set] = defaultdict(set)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part_total, part_stats, part_other in executor.map(
+            _summarize_shard, shards
+        ):
+            total_subjects += part_total
+            for field_path, (count, mask) in part_stats.items():
+                entry = stats_raw.get(field_path)
+                if entry is None:
+                    stats_raw[field_path] = [count, mask]
+                else:
+                    entry[0] += count
+                    entry[1] |= mask
+            for field_path, names in part_other.items():
+                other_types[field_path] |= names
 
     stats: Dict[str, FieldStats] = {}
-    for field, count in present_counts.items():
-        stats[field] = FieldStats(present_count=count, type_names=type_sets[field])
+    for field, (count, mask) in stats_raw.items():
+        names = {name for b, name in _TYPE_NAMES.items() if mask & b}
+        names.update(other_types.get(field, ()))
+        stats[field] = FieldStats(present_count=count, type_names=names)
     return total_subjects, stats
 
 
@@ -176,14 +263,16 @@ def write_tsv(
     output_path: Path, total_subjects: int, stats: Dict[str, FieldStats]
 ) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w") as out:
-        out.write("field\tn_present\tn_missing\tpresent_pct\ttypes\n")
-        for field in sorted(stats.keys()):
-            present = stats[field].present_count
-            missing = max(total_subjects - present, 0)
-            pct = (present / total_subjects) if total_subjects > 0 else 0.0
-            type_str = ",".join(sorted(stats[field].type_names))
-            out.write(f"{field}\t{present}\t{missing}\t{pct:.4f}\t{type_str}\n")
+    # Assemble the whole table and write it with one call instead of a
+    # text-mode write per row.
+    lines = ["field\tn_present\tn_missing\tpresent_pct\ttypes"]
+    for field in sorted(stats.keys()):
+        present = stats[field].present_count
+        missing = max(total_subjects - present, 0)
+        pct = (present / total_subjects) if total_subjects > 0 else 0.0
+        type_str = ",".join(sorted(stats[field].type_names))
+        lines.append(f"{field}\t{present}\t{missing}\t{pct:.4f}\t{type_str}")
+    output_path.write_text("\n".join(lines) + "\n")
 
 
 def main(argv: Iterable[str]) -> int:
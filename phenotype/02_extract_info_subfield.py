@@ -44,10 +44,26 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, Iterable, Iterable as _Iterable, Mapping, Tuple
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+# Parse from raw bytes so orjson's C decoder gets the file verbatim; opening
+# in text mode would add a str-decode pass per subject for no benefit.
+_loads = json.loads if orjson is None else orjson.loads
+
+# File reads release the GIL, so a modest thread pool hides per-file latency
+# while the driver keeps the field-union bookkeeping single-threaded.
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 def parse_args(argv: _Iterable[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -93,32 +109,41 @@ def find_subject_jsons(subjects_root: Path) -> Iterable[Tuple[str, Path]]:
 
     - Only immediate directories are considered subjects.
     - Only exact filename match <sub-id>.flywheel.json is used.
+
+    os.scandir lets DirEntry.is_dir() answer from the dirent type without a
+    stat per child, and the candidate file needs one os.path.isfile instead
+    of the exists()+is_file() pair of stats.
     """
-    if not subjects_root.exists() or not subjects_root.is_dir():
-        return []
+    if not subjects_root.is_dir():
+        return
 
-    for child in sorted(subjects_root.iterdir()):
-        if not child.is_dir():
+    with os.scandir(subjects_root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if not entry.is_dir():
             continue
-        subject_id = child.name
-        candidate = child / f"{subject_id}.flywheel.json"
-        if candidate.exists() and candidate.is_file():
-            yield subject_id, candidate
+        candidate = os.path.join(entry.path, f"{entry.name}.flywheel.json")
+        if os.path.isfile(candidate):
+            yield entry.name, Path(candidate)
 
 
 def flatten_dict(obj: Mapping[str, Any], parent_key: str = "") -> Dict[str, Any]:
     """Flatten nested dict using dot notation for keys.
 
-    Lists are treated as atomic values and not expanded. Dicts are recursively
-    flattened. Only terminal key-paths are returned.
+    Lists are treated as atomic values and not expanded. Dicts are walked
+    iteratively with an explicit stack, writing terminal key-paths straight
+    into one output dict — no per-level temporaries or update() re-hashing.
     """
     flat: Dict[str, Any] = {}
-    for key, value in obj.items():
-        path = f"{parent_key}.{key}" if parent_key else key
-        if isinstance(value, dict):
-            flat.update(flatten_dict(value, parent_key=path))
-        else:
-            flat[path] = value
+    stack = [(parent_key, obj)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                stack.append((path, value))
+            else:
+                flat[path] = value
     return flat
 
 
@@ -163,20 +188,25 @@ def is_excluded(field: str, excludes: Tuple[str, ...]) -> bool:
     return False
 
 
-def resolve_info_subfield(info_obj: Any, subpath: str) -> Tuple[Dict[str, Any], bool]:
-    """Resolve a path under `info`.
+def resolve_info_subfield(
+    info_obj: Any, segments: Tuple[str, ...]
+) -> Tuple[Dict[str, Any], bool]:
+    """Resolve a pre-split path under `info`.
 
-    Returns (mapping, is_dict_like).
+    `segments` is the dot path already split into components (done once per
+    run, not once per subject). Returns (mapping, is_dict_like).
     - If the resolved object is a dict, returns its flattened mapping and True.
     - If scalar/list, returns a single-field mapping where the field name is the
       last segment of the subpath and False.
     - If path cannot be resolved, returns empty mapping and False.
+
+    Only the resolved subtree is ever flattened; siblings under `info` are
+    left untouched.
     """
     if not isinstance(info_obj, dict):
         return {}, False
 
     node: Any = info_obj
-    segments = [s for s in subpath.split(".") if s]
     for seg in segments:
         if isinstance(node, dict) and seg in node:
             node = node[seg]
@@ -191,17 +221,32 @@ def resolve_info_subfield(info_obj: Any, subpath: str) -> Tuple[Dict[str, Any],
     return {leaf_name: node}, False
 
 
-def write_tsv(
-    output_path: Path,
-    header_fields: Tuple[str, ...],
-    rows: Iterable[Tuple[str, Dict[str, str]]],
-) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w") as out:
-        out.write("participant_id\t" + "\t".join(header_fields) + "\n")
-        for participant_id, field_map in rows:
-            values = [field_map.get(h, "") for h in header_fields]
-            out.write(participant_id + "\t" + "\t".join(values) + "\n")
+def _extract_subject(
+    item: Tuple[str, Path], segments: Tuple[str, ...], excludes: Tuple[str, ...]
+) -> Tuple[str, Dict[str, str]] | None:
+    """Load one subject JSON and return (participant_id, filtered fields).
+
+    Returns None for unreadable/invalid files, mirroring the previous serial
+    loop's skip behavior.
+    """
+    subject_id, json_path = item
+    try:
+        data = _loads(json_path.read_bytes())
+    except Exception:
+        return None
+
+    info_obj = data.get("info")
+    flat_map, _ = resolve_info_subfield(info_obj, segments)
+
+    # Apply exclusions
+    filtered: Dict[str, str] = {}
+    for field, value in flat_map.items():
+        if is_excluded(field, excludes):
+            continue
+        filtered[field] = stringify_value(value)
+
+    # participant_id is always `sub-<sub-id>` using directory name as <sub-id>
+    return f"sub-{subject_id}", filtered
 
 
 def main(argv: _Iterable[str]) -> int:
@@ -219,40 +264,43 @@ def main(argv: _Iterable[str]) -> int:
         )
         return 2
 
-    # Accumulate per-subject flattened fields and union of field names
-    per_subject: list[Tuple[str, Dict[str, str]]] = []
-    field_union: set[str] = set()
+    subjects = list(find_subject_jsons(subjects_root))
+    segments = tuple(s for s in info_subfield.split(".") if s)
+    worker = partial(_extract_subject, segments=segments, excludes=excludes)
 
-    for subject_id, json_path in find_subject_jsons(subjects_root):
-        try:
-            with json_path.open("r") as f:
-                data = json.load(f)
-        except Exception:
-            # Skip unreadable or invalid JSON files
-            continue
-
-        info_obj = data.get("info")
-        flat_map, _ = resolve_info_subfield(info_obj, info_subfield)
-
-        # Apply exclusions
-        filtered: Dict[str, str] = {}
-        for field, value in flat_map.items():
-            if is_excluded(field, excludes):
-                continue
-            filtered[field] = stringify_value(value)
-
-        # participant_id is always `sub-<sub-id>` using directory name as <sub-id>
-        participant_id = f"sub-{subject_id}"
-
-        per_subject.append((participant_id, filtered))
-        field_union.update(filtered.keys())
+    # Pass 1: discover the union of field names without retaining any
+    # per-subject data; the per-file load/extract work fans out across
+    # threads and executor.map preserves the sorted subject order.
+    field_union: set[str] = set()
+    with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+        for result in executor.map(worker, subjects):
+            if result is not None:
+                field_union.update(result[1].keys())
 
     header_fields = tuple(sorted(field_union))
-    write_tsv(output, header_fields, per_subject)
 
-    print(
-        f"Wrote {len(per_subject)} rows with {len(header_fields)} fields to: {output}"
-    )
+    # Pass 2: re-extract and stream each row straight to the output file, so
+    # peak memory holds one subject's fields instead of the whole cohort's.
+    rows_written = 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as out, ThreadPoolExecutor(
+        max_workers=_SCAN_WORKERS
+    ) as executor:
+        out.write("participant_id\t" + "\t".join(header_fields) + "\n")
+        for result in executor.map(worker, subjects):
+            if result is None:
+                # Skip unreadable or invalid JSON files
+                continue
+            participant_id, field_map = result
+            out.write(
+                participant_id
+                + "\t"
+                + "\t".join(field_map.get(h, "") for h in header_fields)
+                + "\n"
+            )
+            rows_written += 1
+
+    print(f"Wrote {rows_written} rows with {len(header_fields)} fields to: {output}")
     return 0
 
 
@@ -45,9 +45,10 @@ import argparse
 import csv
 import re
 import sys
+from contextlib import ExitStack
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Mapping, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 
 PARTICIPANT_ID_COL = "participant_id"
@@ -83,73 +84,48 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
 _DIGIT_SPLIT_RE = re.compile(r"(\d+)")
 
 
-def natural_key(text: str) -> List[object]:
-    """Return a list key that enables natural (numeric-aware) sorting.
+def natural_key(text: str) -> Tuple[object, ...]:
+    """Return a tuple key that enables natural (numeric-aware) sorting.
 
-    Example: "10a" sorts after "2" and after "2a".
+    Example: "10a" sorts after "2" and after "2a". Tuples hash and compare
+    element-wise in C, so they make cheaper sort keys than lists.
     """
-    parts = _DIGIT_SPLIT_RE.split(text)
-    key: List[object] = []
-    for part in parts:
-        if part.isdigit():
-            key.append(int(part))
-        else:
-            key.append(part)
-    return key
+    return tuple(
+        int(part) if part.isdigit() else part
+        for part in _DIGIT_SPLIT_RE.split(text)
+    )
 
 
 def split_tokens(name: str) -> List[str]:
     return [t for t in name.split("_") if t != ""]
 
 
-def is_item_column(column: str) -> bool:
-    """Heuristic: a column is an item column if it has any token after the
-    instrument prefix that starts with a digit. This captures patterns like:
+def classify_item_column(col_l: str) -> Tuple[bool, str | None]:
+    """Classify a column as item-like and infer its instrument in one pass.
+
+    A column is an item column if it has any token after the instrument
+    prefix that starts with a digit; the instrument is the underscore-joined
+    prefix tokens before that first digit-led token. This captures patterns
+    like:
     - aces_1
     - hcl16_3_1
     - eswan_dmdd_01a
     - grit_15___2
-    """
-    tokens = split_tokens(column.lower())
-    # Skip leading participant_id and clearly non-instrument roots
-    if not tokens or tokens[0] == PARTICIPANT_ID_COL:
-        return False
-    # Find first token starting with a digit
-    for token in tokens:
-        if token and token[0].isdigit():
-            return True
-    return False
 
-
-def infer_instrument_from_item(column: str) -> str | None:
-    """Infer instrument name from an item-like column by taking tokens up to the
-    first token that starts with a digit.
+    Returns (is_item, instrument_or_None). `col_l` is the already-lowercased
+    column name; the caller lowercases each column once and reuses it here
+    and in the non-item assignment.
     """
-    tokens = split_tokens(column.lower())
+    tokens = split_tokens(col_l)
+    # Skip leading participant_id and clearly non-instrument roots
     if not tokens or tokens[0] == PARTICIPANT_ID_COL:
-        return None
+        return False, None
     inst_tokens: List[str] = []
     for token in tokens:
-        if token and token[0].isdigit():
-            break
+        if token[0].isdigit():
+            return True, "_".join(inst_tokens) if inst_tokens else None
         inst_tokens.append(token)
-    if not inst_tokens:
-        return None
-    return "_".join(inst_tokens)
-
-
-def instrument_prefix_for_column(column: str, instrument: str) -> str:
-    """Return the prefix of a column that corresponds to the instrument.
-
-    If the column starts with the instrument followed by an underscore, we use
-    that. Otherwise return the instrument itself; callers should handle suffix
-    extraction accordingly.
-    """
-    col_l = column.lower()
-    inst_l = instrument.lower()
-    if col_l.startswith(inst_l + "_"):
-        return instrument
-    return instrument
+    return False, None
 
 
 def extract_suffix_after_instrument(column: str, instrument: str) -> str:
@@ -163,34 +139,53 @@ def extract_suffix_after_instrument(column: str, instrument: str) -> str:
     return column
 
 
-def assign_non_item_column(column: str, instruments: List[str]) -> str | None:
+def compile_token_match(instruments: List[str]) -> re.Pattern | None:
+    """Compile one alternation regex matching any instrument as a whole token.
+
+    Alternatives are ordered longest-first so that at a given position the
+    longest instrument wins (e.g. eswan_dmdd before swan).
+    """
+    if not instruments:
+        return None
+    candidates = sorted(instruments, key=len, reverse=True)
+    return re.compile(
+        "(?:^|_)(" + "|".join(re.escape(inst) for inst in candidates) + ")(?:_|$)"
+    )
+
+
+def assign_non_item_column(
+    col_l: str, candidates: List[str], token_match: re.Pattern | None
+) -> str | None:
     """Assign a non-item column to the most likely instrument.
 
     Note: Columns containing "complete" are handled upstream and are not
     assigned to any instrument by this function.
 
+    `col_l` is the column already lowercased by the caller, and `candidates`
+    is the instrument list already sorted longest-first — both computed once
+    per run rather than per column.
+
     Strategy:
-    - Prefer instruments that appear as whole tokens in the column, favoring
-      longer instrument names.
+    - Prefer instruments that appear as whole tokens in the column (one
+      search of the precompiled alternation from compile_token_match,
+      favoring longer instrument names at a given position).
     - Fallback to prefix match (column starts with instrument).
     - As a last resort, handle simple pluralization (instrument ending with 's' or 'es').
     """
-    col_l = column.lower()
-    tokens = split_tokens(col_l)
-    candidates = sorted(instruments, key=len, reverse=True)
-
     # 1) Whole-token match
-    for inst in candidates:
-        pat = re.compile(rf"(^|_){re.escape(inst)}(_|$)")
-        if pat.search(col_l):
-            return inst
+    if token_match is not None:
+        m = token_match.search(col_l)
+        if m:
+            return m.group(1)
 
     # 2) Prefix match
     for inst in candidates:
         if col_l.startswith(inst + "_") or col_l.startswith(inst):
             return inst
 
-    # 3) Simple pluralization fallback, e.g., ace_complete → aces
+    # 3) Simple pluralization fallback, e.g., ace_complete → aces; the
+    # column is only re-tokenized on this rarely-reached path.
+    tokens = split_tokens(col_l)
     if tokens:
         first = tokens[0]
         for inst in candidates:
@@ -221,17 +216,27 @@ def build_instrument_groups(
     """
     instruments: List[str] = []
     col_to_instrument: Dict[str, str] = {}
+    pending: List[Tuple[str, str]] = []
+    leftover: List[str] = []
 
-    # First pass: infer instruments from item columns
+    # Single pass: lowercase and classify each column exactly once. Item
+    # columns register their instrument, completion/"complete" columns go
+    # straight to leftover (misc) unconditionally, and the remaining
+    # non-items are parked with their cached lowercased form until the full
+    # instrument set is known.
     for col in columns:
         if col == PARTICIPANT_ID_COL:
             continue
-        if is_item_column(col):
-            inst = infer_instrument_from_item(col)
-            if inst:
-                col_to_instrument[col] = inst
-                if inst not in instruments:
-                    instruments.append(inst)
+        col_l = col.lower()
+        is_item, inst = classify_item_column(col_l)
+        if is_item and inst:
+            col_to_instrument[col] = inst
+            if inst not in instruments:
+                instruments.append(inst)
+        elif "complete" in col_l:
+            leftover.append(col)
+        else:
+            pending.append((col, col_l))
 
     # Prepare container
     instrument_to_columns: Dict[str, InstrumentColumns] = {
@@ -243,18 +248,13 @@ def build_instrument_groups(
     for col, inst in col_to_instrument.items():
         instrument_to_columns[inst].item_columns.append(col)
 
-    # Second pass: assign non-item columns to best-matching instrument
-    leftover: List[str] = []
-    for col in columns:
-        if col == PARTICIPANT_ID_COL:
-            continue
-        if col in col_to_instrument:
-            continue
-        # Send any completion/"complete" columns to leftover (misc) unconditionally
-        if "complete" in col.lower():
-            leftover.append(col)
-            continue
-        assigned = assign_non_item_column(col, instruments)
+    # Assign the parked non-item columns; the whole-token alternation is
+    # compiled once and the candidate list sorted longest-first once, instead
+    # of per column.
+    token_match = compile_token_match(instruments)
+    candidates = sorted(instruments, key=len, reverse=True)
+    for col, col_l in pending:
+        assigned = assign_non_item_column(col_l, candidates, token_match)
         if assigned is None:
             leftover.append(col)
         else:
@@ -270,47 +270,45 @@ def build_instrument_groups(
     return instrument_to_columns, leftover
 
 
-def write_tsv(path: Path, header: List[str], rows: Iterable[Mapping[str, str]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="") as f:
-        writer = csv.writer(f, delimiter="\t")
-        writer.writerow(header)
-        for row in rows:
-            writer.writerow([row.get(col, "") for col in header])
-
-
-def _get_row_value_case_insensitive(row: Mapping[str, str], key: str) -> str:
-    """Return the value for the first column whose name matches key case-insensitively.
-
-    Returns empty string if not found.
-    """
+def _first_index_case_insensitive(columns: List[str], key: str) -> int | None:
+    """Return the index of the first column matching key case-insensitively."""
     key_l = key.lower()
-    for k, v in row.items():
-        if k.lower() == key_l:
-            return v
-    return ""
+    for i, col in enumerate(columns):
+        if col.lower() == key_l:
+            return i
+    return None
 
 
-def row_should_be_cleared(row: Mapping[str, str]) -> bool:
-    """Determine whether a row should be cleared based on filter criteria.
+def build_clear_criteria(columns: List[str]) -> List[Tuple[int, frozenset]]:
+    """Resolve the row-clearing criteria to column positions once per run.
 
     Criteria (applied only if the corresponding column exists in the input):
       - bbl_protocol must be exactly "GRMPY"
       - statetrait_vcode must be one of {"V", "U", "F"}
       - admin_proband must be exactly "p"
     """
-    protocol = _get_row_value_case_insensitive(row, "bbl_protocol")
-    if protocol != "" and protocol != "GRMPY":
-        return True
-
-    vcode = _get_row_value_case_insensitive(row, "statetrait_vcode")
-    if vcode != "" and vcode not in {"V", "U", "F"}:
-        return True
-
-    proband = _get_row_value_case_insensitive(row, "admin_proband")
-    if proband != "" and proband != "p":
-        return True
-
+    criteria: List[Tuple[int, frozenset]] = []
+    for key, allowed in (
+        ("bbl_protocol", frozenset({"GRMPY"})),
+        ("statetrait_vcode", frozenset({"V", "U", "F"})),
+        ("admin_proband", frozenset({"p"})),
+    ):
+        idx = _first_index_case_insensitive(columns, key)
+        if idx is not None:
+            criteria.append((idx, allowed))
+    return criteria
+
+
+def row_should_be_cleared(row: List[str], criteria: List[Tuple[int, frozenset]]) -> bool:
+    """Determine whether a row should be cleared based on resolved criteria.
+
+    Empty values never trigger clearing (a blank criterion is ignored).
+    """
+    for idx, allowed in criteria:
+        if idx < len(row):
+            value = row[idx]
+            if value != "" and value not in allowed:
+                return True
     return False
 
 
@@ -346,46 +344,47 @@ def main(argv: Iterable[str]) -> int:
         misc_cols.sort(key=lambda c: c.lower())
         misc_header = [PARTICIPANT_ID_COL] + misc_cols
 
-    # Stream rows and write per-instrument outputs in one pass
-    outputs: Dict[str, Tuple[Path, List[List[str]]]] = {}
-    for inst in instrument_headers:
-        out_path = args.output_dir / f"{inst}.tsv"
-        outputs[inst] = (out_path, [])
+    # Map every output column to its input position once; rows are then
+    # sliced by index instead of rebuilt as per-row dicts.
+    col_pos = {col: i for i, col in enumerate(columns)}
+    pid_idx = col_pos.get(PARTICIPANT_ID_COL)
+    criteria = build_clear_criteria(columns)
+
+    output_headers: Dict[str, List[str]] = dict(instrument_headers)
     if misc_header:
-        outputs["misc"] = (args.output_dir / "misc.tsv", [])
+        output_headers["misc"] = misc_header
+
+    # Stream rows straight to one open writer per output file; nothing is
+    # accumulated in memory beyond the current input row.
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    with args.input.open("r", newline="") as f, ExitStack() as stack:
+        reader = csv.reader(f, delimiter="\t")
+        next(reader, None)  # header row already consumed above
+
+        writers: List[Tuple[csv.writer, List[int | None]]] = []
+        for name, header in output_headers.items():
+            out_f = stack.enter_context(
+                (args.output_dir / f"{name}.tsv").open("w", newline="")
+            )
+            writer = csv.writer(out_f, delimiter="\t")
+            writer.writerow(header)
+            writers.append((writer, [col_pos.get(col) for col in header]))
 
-    with args.input.open("r", newline="") as f:
-        reader = csv.DictReader(f, delimiter="\t")
         for row in reader:
-            should_clear = row_should_be_cleared(row)
-            for inst, header in instrument_headers.items():
-                if should_clear:
-                    cleared_row = {col: "" for col in header}
-                    cleared_row[PARTICIPANT_ID_COL] = row.get(PARTICIPANT_ID_COL, "")
-                    outputs[inst][1].append(cleared_row)
-                else:
-                    outputs[inst][1].append({col: row.get(col, "") for col in header})
-            if misc_header:
-                if should_clear:
-                    cleared_misc = {col: "" for col in misc_header}
-                    cleared_misc[PARTICIPANT_ID_COL] = row.get(PARTICIPANT_ID_COL, "")
-                    outputs["misc"][1].append(cleared_misc)
-                else:
-                    outputs["misc"][1].append(
-                        {col: row.get(col, "") for col in misc_header}
+            n = len(row)
+            pid = row[pid_idx] if pid_idx is not None and pid_idx < n else ""
+            if row_should_be_cleared(row, criteria):
+                for writer, idxs in writers:
+                    writer.writerow([pid] + [""] * (len(idxs) - 1))
+            else:
+                for writer, idxs in writers:
+                    writer.writerow(
+                        [row[i] if i is not None and i < n else "" for i in idxs]
                     )
 
-    # Write files
-    for inst, (path, rows) in outputs.items():
-        if inst == "misc":
-            header = misc_header
-        else:
-            header = instrument_headers[inst]
-        write_tsv(path, header, rows)
-
     print(
-        f"Wrote {len(outputs)} files to {args.output_dir}"
-        + (" (including misc.tsv)" if "misc" in outputs else "")
+        f"Wrote {len(output_headers)} files to {args.output_dir}"
+        + (" (including misc.tsv)" if "misc" in output_headers else "")
     )
 
     return 0
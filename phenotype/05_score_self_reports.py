@@ -23,8 +23,11 @@ from __future__ import annotations
 
 import argparse
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
 
@@ -35,6 +38,15 @@ except Exception as exc:  # pragma: no cover - import error path
         "pandas is required. Please install it (e.g., `pip install pandas`)."
     ) from exc
 
+try:
+    import bottleneck as bn
+except ImportError:  # optional speedup; numpy reductions are the fallback
+    bn = None
+
+# bottleneck's nansum is a hand-written C loop over the contiguous float64
+# blocks _numeric_block produces; numpy's is the drop-in fallback.
+_nansum = np.nansum if bn is None else bn.nansum
+
 
 PARTICIPANT_ID_COL = "participant_id"
 
@@ -89,88 +101,199 @@ def to_numeric(series: pd.Series) -> pd.Series:
     return pd.to_numeric(series, errors="coerce")
 
 
-def sum_columns(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+def _nan_series(df: pd.DataFrame) -> pd.Series:
+    return pd.Series(np.nan, index=df.index)
+
+
+def _numeric_block(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """Return the selected columns as one float64 matrix with NaN for missing.
+
+    Already-numeric columns are copied straight from their buffers; object
+    columns (the common case after _fill_empty_with_na) go through one
+    pd.to_numeric call each. Row reductions then run on the contiguous
+    ndarray instead of a per-column pandas apply dispatch.
+    """
+    out = np.empty((len(df), len(columns)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        s = df[col]
+        if isinstance(s.dtype, np.dtype) and s.dtype.kind in "biuf":
+            out[:, j] = s.to_numpy(dtype=np.float64)
+        else:
+            out[:, j] = pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64)
+    return out
+
+
+def sum_columns(df: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
     existing = [c for c in columns if c in df.columns]
     if not existing:
-        return pd.Series([math.nan] * len(df), index=df.index)
-    return df[existing].apply(pd.to_numeric, errors="coerce").sum(axis=1, min_count=1)
+        return _nan_series(df)
+    arr = _numeric_block(df, existing)
+    # min_count=1 semantics: rows with no valid values stay NaN
+    has_any = ~np.isnan(arr).all(axis=1)
+    return pd.Series(np.where(has_any, _nansum(arr, axis=1), np.nan), index=df.index)
 
 
-def sum_columns_complete(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+def sum_columns_complete(df: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
     """Sum columns only where all columns have valid values (n/a/missing → NaN in total)."""
     existing = [c for c in columns if c in df.columns]
     if not existing or len(existing) != len(columns):
-        return pd.Series([math.nan] * len(df), index=df.index)
-    num = df[existing].apply(pd.to_numeric, errors="coerce")
-    all_present = num.notna().all(axis=1)
-    return num.sum(axis=1).where(all_present)
+        return _nan_series(df)
+    arr = _numeric_block(df, existing)
+    all_present = ~np.isnan(arr).any(axis=1)
+    return pd.Series(
+        np.where(all_present, arr.sum(axis=1), np.nan), index=df.index
+    )
 
 
-def sum_columns_complete_transform(
-    df: pd.DataFrame,
-    columns: List[str],
-    transform: Callable[[pd.Series], pd.Series],
+def sum_columns_complete_reversed(
+    df: pd.DataFrame, columns: Sequence[str], lo_plus_hi: float
 ) -> pd.Series:
-    """Sum of transform(col) only where all columns have valid values."""
+    """Sum of reverse-coded items, only where all columns have valid values.
+
+    Reverse coding maps x on a lo..hi scale to (lo + hi) - x, so a single
+    scalar subtraction on the numeric block replaces the per-column
+    transform Series the old helper allocated.
+    """
     existing = [c for c in columns if c in df.columns]
     if not existing or len(existing) != len(columns):
-        return pd.Series([math.nan] * len(df), index=df.index)
-    num = df[existing].apply(pd.to_numeric, errors="coerce")
-    all_present = num.notna().all(axis=1)
-    transformed = pd.DataFrame({c: transform(df[c]) for c in existing})
-    return transformed.sum(axis=1).where(all_present)
+        return _nan_series(df)
+    arr = _numeric_block(df, existing)
+    all_present = ~np.isnan(arr).any(axis=1)
+    np.subtract(lo_plus_hi, arr, out=arr)
+    return pd.Series(
+        np.where(all_present, arr.sum(axis=1), np.nan), index=df.index
+    )
 
 
-def mean_columns(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+def mean_columns(df: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
     existing = [c for c in columns if c in df.columns]
     if not existing:
-        return pd.Series([math.nan] * len(df), index=df.index)
-    return df[existing].apply(pd.to_numeric, errors="coerce").mean(axis=1)
+        return _nan_series(df)
+    arr = _numeric_block(df, existing)
+    counts = (~np.isnan(arr)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = _nansum(arr, axis=1) / counts
+    return pd.Series(means, index=df.index)
 
 
-def mean_columns_complete(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+def mean_columns_complete(df: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
     """Mean only where all columns have valid values (n/a/missing → NaN)."""
     existing = [c for c in columns if c in df.columns]
     if not existing or len(existing) != len(columns):
-        return pd.Series([math.nan] * len(df), index=df.index)
-    num = df[existing].apply(pd.to_numeric, errors="coerce")
-    all_present = num.notna().all(axis=1)
-    return num.mean(axis=1).where(all_present)
+        return _nan_series(df)
+    arr = _numeric_block(df, existing)
+    all_present = ~np.isnan(arr).any(axis=1)
+    return pd.Series(
+        np.where(all_present, arr.mean(axis=1), np.nan), index=df.index
+    )
 
 
-def reverse_1_to_4(series: pd.Series) -> pd.Series:
-    # R code uses (4 - x) + 1 == 5 - x
-    return 5 - to_numeric(series)
+def sum_items_reversed_subset(
+    df: pd.DataFrame, columns: Sequence[str], rev_set: frozenset
+) -> pd.Series:
+    """Sum items on a 1-4 scale, reverse-coding those in rev_set.
 
+    Reverse coding follows the R source: (4 - x) + 1 == 5 - x. The sum is
+    gated on all items being present, like sum_columns_complete, and the
+    reversal happens in place on the numeric block's own buffer.
+    """
+    existing = [c for c in columns if c in df.columns]
+    if not existing or len(existing) != len(columns):
+        return _nan_series(df)
+    arr = _numeric_block(df, existing)
+    all_present = ~np.isnan(arr).any(axis=1)
+    for j, c in enumerate(existing):
+        if c in rev_set:
+            arr[:, j] = 5.0 - arr[:, j]
+    return pd.Series(
+        np.where(all_present, arr.sum(axis=1), np.nan), index=df.index
+    )
 
-def reverse_0_to_1(series: pd.Series) -> pd.Series:
-    # R code uses (1 - x) for binary-like items
-    return 1 - to_numeric(series)
+
+# Item-column lists are fixed per instrument, so build them once at import
+# time instead of re-running the f-string loops on every scorer call.
+ALS_ITEMS = tuple(f"als_{i}" for i in range(1, 19))
+MAPSSR_ITEMS = tuple(f"mapssr_{i}" for i in range(1, 16))
+MAPSSR_SOCIAL = ("mapssr_1", "mapssr_2", "mapssr_3")
+MAPSSR_RECVOC = ("mapssr_4", "mapssr_5", "mapssr_6")
+MAPSSR_MOTRELATION = ("mapssr_7", "mapssr_8", "mapssr_9")
+MAPSSR_ENGAGE = tuple(f"mapssr_{i}" for i in range(10, 16))
+ACES_ITEMS = tuple(f"aces_{i}" for i in range(1, 11))
+SCARED_ITEMS = tuple(f"scared_{i}" for i in range(1, 42))
+RPAQ_PROACTIVE = tuple(
+    f"rpaq_{i}" for i in (2, 4, 6, 9, 10, 12, 15, 17, 18, 20, 21, 23)
+)
+RPAQ_REACTIVE = tuple(f"rpaq_{i}" for i in (1, 3, 5, 7, 8, 11, 13, 14, 16, 19, 22))
+ARI_ITEMS = tuple(f"ari_{i}" for i in range(1, 7))
+# All BDI items 1-21 except bdi_19a (bdi_19 is included)
+BDI_ITEMS = tuple(f"bdi_{i}" for i in range(1, 22))
+BIS1_ITEMS = tuple(f"bisbas_{i}" for i in (8, 13, 16, 19, 24))  # reversed
+BIS2_ITEMS = ("bisbas_2", "bisbas_22")  # not reversed
+BAS_DRIVE_ITEMS = tuple(f"bisbas_{i}" for i in (3, 9, 12, 21))
+BAS_FUN_ITEMS = tuple(f"bisbas_{i}" for i in (5, 10, 15, 20))
+BAS_REWARD_ITEMS = tuple(f"bisbas_{i}" for i in (4, 7, 14, 18, 23))
+GRIT_GRITTINESS = tuple(f"grit_{i}" for i in (2, 4, 5, 7, 8, 10))
+GRIT_OPENNESS = tuple(f"grit_{i}" for i in (1, 3, 6, 9, 11, 12))
+# HCL-16 item columns: hcl16_3_1 through hcl16_3_16
+HCL16_ITEMS = tuple(f"hcl16_3_{i}" for i in range(1, 17))
+BSS_ITEMS = tuple(f"bss_{i}" for i in range(1, 9))
+# RPAS/RSAS short forms: 15 items each with mixed reverse coding
+PHYS_ANHED_STRAIGHT = tuple(f"phys_anhed_{i}" for i in (5, 6, 8, 10))
+PHYS_ANHED_REVERSED = tuple(
+    f"phys_anhed_{i}" for i in (1, 2, 3, 4, 7, 9, 11, 12, 13, 14, 15)
+)
+SOC_ANHED_STRAIGHT = tuple(f"soc_anhed_{i}" for i in (1, 2, 3, 5, 6, 7, 8, 10, 15))
+SOC_ANHED_REVERSED = tuple(f"soc_anhed_{i}" for i in (4, 9, 11, 12, 13, 14))
+ESWAN_DMDD_HOME = tuple(f"eswan_dmdd_{i:02d}a" for i in range(1, 11))
+ESWAN_DMDD_FRIEND = tuple(f"eswan_dmdd_{i:02d}b" for i in range(1, 11))
+ESWAN_DMDD_SCHOOL = tuple(f"eswan_dmdd_{i:02d}c" for i in range(1, 11))
+ESWAN_DMDD_ITEMS = ESWAN_DMDD_HOME + ESWAN_DMDD_FRIEND + ESWAN_DMDD_SCHOOL
+PSQI_DISTURB_COLS = (
+    "psqi_5b",
+    "psqi_5c",
+    "psqi_5d",
+    "psqi_5e",
+    "psqi_5f",
+    "psqi_5g",
+    "psqi_5h",
+    "psqi_5i",
+    "psqi_5othera",
+)
+PSQI_COMPONENT_COLS = tuple(f"psqi_score_component{i}" for i in range(1, 8))
+BEST_MS_SUBSCALE_A = tuple(f"best_ms_{i}" for i in range(1, 9))
+BEST_MS_SUBSCALE_B = tuple(f"best_ms_{i}" for i in range(9, 13))
+# BISS in this dataset has 43 items, not 44
+BISS_ITEMS = tuple(f"biss_{i}" for i in range(1, 44))
+MADRS_ITEMS = tuple(f"madrs_{i}" for i in range(1, 11))
+STAI_STATE_ITEMS = tuple(f"stai_q_{i:02d}" for i in range(1, 21))
+STAI_TRAIT_ITEMS = tuple(f"stai_q_{i:02d}" for i in range(21, 41))
+STAI_REV_ITEMS = frozenset(
+    f"stai_q_{i:02d}"
+    for i in (1, 2, 5, 8, 10, 11, 15, 16, 19, 20, 21, 23, 26, 27, 30, 33, 34, 36, 39)
+)
+STAI_STATE_REV_ITEMS = frozenset(
+    f"stai_q_{i:02d}" for i in (1, 2, 5, 8, 10, 11, 15, 16, 19, 20)
+)
+STAXI2_STATE_ANGER = tuple(f"staxi2_ca_{i}" for i in range(1, 11))
+STAXI2_STATE_ANGER_FEELINGS = tuple(f"staxi2_ca_{i}" for i in (1, 2, 3, 8, 10))
+STAXI2_STATE_ANGER_EXPRESSION = tuple(f"staxi2_ca_{i}" for i in (4, 5, 6, 7, 9))
+STAXI2_TRAIT_ANGER = tuple(f"staxi2_ca_{i}" for i in range(11, 21))
+STAXI2_TRAIT_ANGER_TEMPERAMENT = tuple(f"staxi2_ca_{i}" for i in (11, 12, 13, 16, 19))
+STAXI2_TRAIT_ANGER_REACTION = tuple(f"staxi2_ca_{i}" for i in (14, 15, 17, 18, 20))
 
 
 def add_als_scores(df: pd.DataFrame) -> pd.DataFrame:
-    item_cols = [f"als_{i}" for i in range(1, 19)]
-    df["als_score_avg"] = mean_columns_complete(df, item_cols)
+    df["als_score_avg"] = mean_columns_complete(df, ALS_ITEMS)
     return df
 
 
 def add_mapssr_scores(df: pd.DataFrame) -> pd.DataFrame:
     # Columns are prefixed with mapssr_
-    item_cols = [f"mapssr_{i}" for i in range(1, 16)]
-    df["mapssr_rawtot_sum"] = sum_columns_complete(df, item_cols)
-    df["mapssr_social_sum"] = sum_columns_complete(
-        df, ["mapssr_1", "mapssr_2", "mapssr_3"]
-    )
-    df["mapssr_recvoc_sum"] = sum_columns_complete(
-        df, ["mapssr_4", "mapssr_5", "mapssr_6"]
-    )
-    df["mapssr_motrelation_sum"] = sum_columns_complete(
-        df, ["mapssr_7", "mapssr_8", "mapssr_9"]
-    )
-    df["mapssr_engage_sum"] = sum_columns_complete(
-        df,
-        ["mapssr_10", "mapssr_11", "mapssr_12", "mapssr_13", "mapssr_14", "mapssr_15"],
-    )
+    df["mapssr_rawtot_sum"] = sum_columns_complete(df, MAPSSR_ITEMS)
+    df["mapssr_social_sum"] = sum_columns_complete(df, MAPSSR_SOCIAL)
+    df["mapssr_recvoc_sum"] = sum_columns_complete(df, MAPSSR_RECVOC)
+    df["mapssr_motrelation_sum"] = sum_columns_complete(df, MAPSSR_MOTRELATION)
+    df["mapssr_engage_sum"] = sum_columns_complete(df, MAPSSR_ENGAGE)
     return df
 
 
@@ -223,181 +346,135 @@ def add_swan_scores(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def add_aces_scores(df: pd.DataFrame) -> pd.DataFrame:
-    aces_items = [f"aces_{i}" for i in range(1, 11)]
-    df["aces_score_total"] = sum_columns_complete(df, aces_items)
+    df["aces_score_total"] = sum_columns_complete(df, ACES_ITEMS)
     return df
 
 
 def add_scared_scores(df: pd.DataFrame) -> pd.DataFrame:
-    item_cols = [f"scared_{i}" for i in range(1, 42)]
-    total = sum_columns_complete(df, item_cols)
+    total = sum_columns_complete(df, SCARED_ITEMS)
     df["scared_score_total"] = total
-    df["scared_score_anxietyDisorder"] = (
-        (to_numeric(total) >= 25)
-        .astype("float")
-        .where(~total.isna(), other=math.nan)
-        .astype("Int64")
+    # One pass: 0/1 threshold with NaN passthrough, then the nullable cast.
+    total_np = total.to_numpy(dtype=np.float64)
+    flag = np.where(np.isnan(total_np), np.nan, (total_np >= 25).astype(np.float64))
+    df["scared_score_anxietyDisorder"] = pd.Series(flag, index=df.index).astype(
+        "Int64"
     )
     return df
 
 
 def add_rpaq_scores(df: pd.DataFrame) -> pd.DataFrame:
-    proactive = [2, 4, 6, 9, 10, 12, 15, 17, 18, 20, 21, 23]
-    reactive = [1, 3, 5, 7, 8, 11, 13, 14, 16, 19, 22]
-    df["rpaq_score_proactiveTotal"] = sum_columns_complete(
-        df, [f"rpaq_{i}" for i in proactive]
-    )
-    df["rpaq_score_reactiveTotal"] = sum_columns_complete(
-        df, [f"rpaq_{i}" for i in reactive]
-    )
+    df["rpaq_score_proactiveTotal"] = sum_columns_complete(df, RPAQ_PROACTIVE)
+    df["rpaq_score_reactiveTotal"] = sum_columns_complete(df, RPAQ_REACTIVE)
     return df
 
 
 def add_ari_scores(df: pd.DataFrame) -> pd.DataFrame:
-    items = [f"ari_{i}" for i in range(1, 7)]
-    df["ari_score_avg"] = mean_columns_complete(df, items)
-    df["ari_score_total"] = sum_columns_complete(df, items)
+    df["ari_score_avg"] = mean_columns_complete(df, ARI_ITEMS)
+    df["ari_score_total"] = sum_columns_complete(df, ARI_ITEMS)
     return df
 
 
 def add_bdi_scores(df: pd.DataFrame) -> pd.DataFrame:
-    # Sum all BDI items 1–21 except bdi_19a (include bdi_19)
-    expected = [f"bdi_{i}" for i in range(1, 22)]
-    df["bdi_score_total"] = sum_columns_complete(df, expected)
+    df["bdi_score_total"] = sum_columns_complete(df, BDI_ITEMS)
     return df
 
 
 def add_bisbas_scores(df: pd.DataFrame) -> pd.DataFrame:
     # BIS total: reverse code select items from 1..4 scale
-    bis1_items = [8, 13, 16, 19, 24]  # reversed
-    bis2_items = [2, 22]  # not reversed
-    bis1_cols = [f"bisbas_{i}" for i in bis1_items]
-    bis2_cols = [f"bisbas_{i}" for i in bis2_items]
-
-    s1 = sum_columns_complete_transform(df, bis1_cols, reverse_1_to_4)
-    s2 = sum_columns_complete(df, bis2_cols)
+    s1 = sum_columns_complete_reversed(df, BIS1_ITEMS, 5.0)  # 1-4 scale: 5 - x
+    s2 = sum_columns_complete(df, BIS2_ITEMS)
     df["bis_score_total"] = (s1 + s2).where(s1.notna() & s2.notna())
 
     # BAS subscales (reverse-coded)
-    bas_drive = [3, 9, 12, 21]
-    bas_fun = [5, 10, 15, 20]
-    bas_reward = [4, 7, 14, 18, 23]
-
-    df["bas_score_driveTotal"] = sum_columns_complete_transform(
-        df, [f"bisbas_{i}" for i in bas_drive], reverse_1_to_4
+    df["bas_score_driveTotal"] = sum_columns_complete_reversed(
+        df, BAS_DRIVE_ITEMS, 5.0
     )
-    df["bas_score_funTotal"] = sum_columns_complete_transform(
-        df, [f"bisbas_{i}" for i in bas_fun], reverse_1_to_4
-    )
-    df["bas_score_rewardTotal"] = sum_columns_complete_transform(
-        df, [f"bisbas_{i}" for i in bas_reward], reverse_1_to_4
+    df["bas_score_funTotal"] = sum_columns_complete_reversed(df, BAS_FUN_ITEMS, 5.0)
+    df["bas_score_rewardTotal"] = sum_columns_complete_reversed(
+        df, BAS_REWARD_ITEMS, 5.0
     )
     return df
 
 
 def add_grit_scores(df: pd.DataFrame) -> pd.DataFrame:
-    grittiness = [2, 4, 5, 7, 8, 10]
-    openness = [1, 3, 6, 9, 11, 12]
-    df["grit_score_grittiness"] = mean_columns_complete(
-        df, [f"grit_{i}" for i in grittiness]
-    )
-    df["grit_score_openness"] = mean_columns_complete(
-        df, [f"grit_{i}" for i in openness]
-    )
+    df["grit_score_grittiness"] = mean_columns_complete(df, GRIT_GRITTINESS)
+    df["grit_score_openness"] = mean_columns_complete(df, GRIT_OPENNESS)
     return df
 
 
 def add_hcl16_scores(df: pd.DataFrame) -> pd.DataFrame:
-    # HCL-16 item columns: hcl16_3_1 through hcl16_3_16
-    item_cols = [f"hcl16_3_{i}" for i in range(1, 17)]
-    df["hcl_score_total"] = sum_columns_complete(df, item_cols)
+    df["hcl_score_total"] = sum_columns_complete(df, HCL16_ITEMS)
     return df
 
 
 def add_bss_scores(df: pd.DataFrame) -> pd.DataFrame:
-    items = [f"bss_{i}" for i in range(1, 9)]
-    df["bss_score_mean"] = mean_columns_complete(df, items)
-    df["bss_score_experience"] = mean_columns_complete(df, ["bss_1", "bss_5"])
-    df["bss_score_boredom"] = mean_columns_complete(df, ["bss_2", "bss_6"])
-    df["bss_score_thrill"] = mean_columns_complete(df, ["bss_3", "bss_7"])
-    df["bss_score_disinhibition"] = mean_columns_complete(df, ["bss_4", "bss_8"])
+    if all(c in df.columns for c in BSS_ITEMS):
+        arr = _numeric_block(df, BSS_ITEMS)
+        all_present = ~np.isnan(arr).any(axis=1)
+        df["bss_score_mean"] = np.where(all_present, arr.mean(axis=1), np.nan)
+        # The subscales pair item k with item k+4, so a (rows, 4 subscales,
+        # 2 items) view of the same buffer yields all four means in one
+        # reduction instead of four separate 2-column coercions.
+        pairs = arr.reshape(len(df), 2, 4).transpose(0, 2, 1)
+        pair_present = ~np.isnan(pairs).any(axis=2)
+        pair_means = np.where(pair_present, pairs.mean(axis=2), np.nan)
+        df["bss_score_experience"] = pair_means[:, 0]
+        df["bss_score_boredom"] = pair_means[:, 1]
+        df["bss_score_thrill"] = pair_means[:, 2]
+        df["bss_score_disinhibition"] = pair_means[:, 3]
+    else:
+        # Partial files keep the per-subscale gating of the generic helper.
+        df["bss_score_mean"] = mean_columns_complete(df, BSS_ITEMS)
+        df["bss_score_experience"] = mean_columns_complete(df, ("bss_1", "bss_5"))
+        df["bss_score_boredom"] = mean_columns_complete(df, ("bss_2", "bss_6"))
+        df["bss_score_thrill"] = mean_columns_complete(df, ("bss_3", "bss_7"))
+        df["bss_score_disinhibition"] = mean_columns_complete(df, ("bss_4", "bss_8"))
     return df
 
 
 def add_phys_anhed_scores(df: pd.DataFrame) -> pd.DataFrame:
-    # RPAS short: 15 items with mixed reverse coding
-    part1 = ["phys_anhed_5", "phys_anhed_6", "phys_anhed_8", "phys_anhed_10"]
-    part2 = [
-        "phys_anhed_1",
-        "phys_anhed_2",
-        "phys_anhed_3",
-        "phys_anhed_4",
-        "phys_anhed_7",
-        "phys_anhed_9",
-        "phys_anhed_11",
-        "phys_anhed_12",
-        "phys_anhed_13",
-        "phys_anhed_14",
-        "phys_anhed_15",
-    ]
-    s1 = sum_columns_complete(df, part1)
-    s2 = sum_columns_complete_transform(df, part2, reverse_0_to_1)
+    s1 = sum_columns_complete(df, PHYS_ANHED_STRAIGHT)
+    s2 = sum_columns_complete_reversed(
+        df, PHYS_ANHED_REVERSED, 1.0
+    )  # binary items: 1 - x
     df["rpasShort_score_total"] = (s1 + s2).where(s1.notna() & s2.notna())
     return df
 
 
 def add_soc_anhed_scores(df: pd.DataFrame) -> pd.DataFrame:
-    # RSAS short: 15 items with mixed reverse coding
-    part1 = [
-        "soc_anhed_1",
-        "soc_anhed_2",
-        "soc_anhed_3",
-        "soc_anhed_5",
-        "soc_anhed_6",
-        "soc_anhed_7",
-        "soc_anhed_8",
-        "soc_anhed_10",
-        "soc_anhed_15",
-    ]
-    part2 = [
-        "soc_anhed_4",
-        "soc_anhed_9",
-        "soc_anhed_11",
-        "soc_anhed_12",
-        "soc_anhed_13",
-        "soc_anhed_14",
-    ]
-    s1 = sum_columns_complete(df, part1)
-    s2 = sum_columns_complete_transform(df, part2, reverse_0_to_1)
+    s1 = sum_columns_complete(df, SOC_ANHED_STRAIGHT)
+    s2 = sum_columns_complete_reversed(
+        df, SOC_ANHED_REVERSED, 1.0
+    )  # binary items: 1 - x
     df["rsasShort_score_total"] = (s1 + s2).where(s1.notna() & s2.notna())
     return df
 
 
 def add_eswan_dmdd_scores(df: pd.DataFrame) -> pd.DataFrame:
-    def seq(tag: str) -> List[str]:
-        return [f"eswan_dmdd_{i:02d}{tag}" for i in range(1, 11)]
-
     # Subtract 4 from each item once (so final TSV has adjusted values); skip if already adjusted
-    item_cols = seq("a") + seq("b") + seq("c")
-    existing_items = [c for c in item_cols if c in df.columns]
+    existing_items = [c for c in ESWAN_DMDD_ITEMS if c in df.columns]
+    arr = None
     if existing_items:
-        num = df[existing_items].apply(pd.to_numeric, errors="coerce")
+        arr = _numeric_block(df, existing_items)
         # If any value is negative, data have already been adjusted (prior run)
-        if not (num < 0).any().any():
-            for c in existing_items:
-                df[c] = to_numeric(df[c]) - 4
-
-    def sum_when_all_items_present(columns: List[str]) -> pd.Series:
-        existing = [c for c in columns if c in df.columns]
-        if not existing or len(existing) != len(columns):
-            return pd.Series([math.nan] * len(df), index=df.index)
-        num = df[existing].apply(pd.to_numeric, errors="coerce")
-        all_present = num.notna().all(axis=1)
-        return num.sum(axis=1).where(all_present)
-
-    home = sum_when_all_items_present(seq("a"))
-    friend = sum_when_all_items_present(seq("b"))
-    school = sum_when_all_items_present(seq("c"))
+        if not np.any(arr < 0):
+            arr -= 4
+            df[existing_items] = arr
+
+    if arr is not None and len(existing_items) == len(ESWAN_DMDD_ITEMS):
+        # All 30 items present (the usual case): view the already-adjusted
+        # block as (rows, 3 contexts, 10 items) and reduce the item axis once
+        # for all three subscales instead of re-coercing each context.
+        cube = arr.reshape(len(df), 3, 10)
+        all_present = ~np.isnan(cube).any(axis=2)
+        subs = np.where(all_present, cube.sum(axis=2), np.nan)
+        home = pd.Series(subs[:, 0], index=df.index)
+        friend = pd.Series(subs[:, 1], index=df.index)
+        school = pd.Series(subs[:, 2], index=df.index)
+    else:
+        home = sum_columns_complete(df, ESWAN_DMDD_HOME)
+        friend = sum_columns_complete(df, ESWAN_DMDD_FRIEND)
+        school = sum_columns_complete(df, ESWAN_DMDD_SCHOOL)
     df["eswanDMDD_score_homeOutburst"] = home
     df["eswanDMDD_score_friendOutburst"] = friend
     df["eswanDMDD_score_schoolOutburst"] = school
@@ -408,29 +485,28 @@ def add_eswan_dmdd_scores(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _parse_hhmm_to_hours(value: Optional[float]) -> Optional[float]:
-    if value is None or (isinstance(value, float) and math.isnan(value)):
-        return None
-    try:
-        iv = int(value)
-    except Exception:
-        try:
-            iv = int(float(value))  # type: ignore[arg-type]
-        except Exception:
-            return None
-    s = f"{iv:04d}"
-    hh = int(s[:2])
-    mm = int(s[2:])
-    if not (0 <= hh <= 23 and 0 <= mm <= 59):
-        return None
-    return hh + (mm / 60.0)
+def _parse_hhmm_to_hours(series: pd.Series) -> np.ndarray:
+    """Convert HHMM-encoded clock times to decimal hours, NaN where invalid.
+
+    Vectorized version of the old scalar parser: values are coerced to
+    numbers, truncated to integers, split into hh/mm by integer division,
+    and range-checked (0-23 hours, 0-59 minutes). Anything unparseable or
+    out of range - including negatives - comes back as NaN.
+    """
+    v = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+    iv = np.where(np.isnan(v), 0, v).astype(np.int64)
+    hh = iv // 100
+    mm = iv - hh * 100
+    valid = (~np.isnan(v)) & (hh >= 0) & (hh <= 23) & (mm >= 0) & (mm <= 59)
+    return np.where(valid, hh + mm / 60.0, np.nan)
 
 
 def add_psqi_scores(df: pd.DataFrame) -> pd.DataFrame:
-    # Drop psqi_*_text free-text columns (not needed in scored output)
-    text_cols = [c for c in df.columns if c.startswith("psqi_") and c.endswith("_text")]
-    if text_cols:
-        df = df.drop(columns=text_cols)
+    # Drop psqi_*_text free-text columns (not needed in scored output); the
+    # Index string methods run the predicate in one C pass over the header.
+    text_mask = df.columns.str.startswith("psqi_") & df.columns.str.endswith("_text")
+    if text_mask.any():
+        df = df.drop(columns=df.columns[text_mask])
 
     # Reorder so psqi_5_other and psqi_5othera follow psqi_5a..psqi_5i
     move_after = "psqi_5i"
@@ -449,96 +525,108 @@ def add_psqi_scores(df: pd.DataFrame) -> pd.DataFrame:
     else:
         df["psqi_score_component1"] = math.nan
 
-    # Component 2
-    comp2_1 = pd.Series([math.nan] * len(df), index=df.index)
+    # Component 2. NaN compares False against every condition, so missing
+    # values fall through to np.select's NaN default just as the old chained
+    # .mask() ladder left them untouched — one pass instead of four.
+    comp2_1 = np.full(len(df), np.nan)
     if "psqi_2" in df:
-        mins = to_numeric(df["psqi_2"])  # minutes to fall asleep
-        comp2_1 = pd.Series([math.nan] * len(df), index=df.index)
-        comp2_1 = comp2_1.mask(~mins.isna() & (mins <= 15), 0)
-        comp2_1 = comp2_1.mask(~mins.isna() & (mins >= 16) & (mins <= 30), 1)
-        comp2_1 = comp2_1.mask(~mins.isna() & (mins >= 31) & (mins <= 60), 2)
-        comp2_1 = comp2_1.mask(~mins.isna() & (mins > 60), 3)
+        mins = to_numeric(df["psqi_2"]).to_numpy(
+            dtype=np.float64
+        )  # minutes to fall asleep
+        comp2_1 = np.select(
+            [
+                mins <= 15,
+                (mins >= 16) & (mins <= 30),
+                (mins >= 31) & (mins <= 60),
+                mins > 60,
+            ],
+            [0.0, 1.0, 2.0, 3.0],
+            default=np.nan,
+        )
 
     comp2_2 = (
-        to_numeric(df["psqi_5a"])
+        to_numeric(df["psqi_5a"]).to_numpy(dtype=np.float64)
         if "psqi_5a" in df
-        else pd.Series([math.nan] * len(df), index=df.index)
+        else np.full(len(df), np.nan)
     )
     comp2_3 = comp2_1 + comp2_2
-    comp2 = pd.Series([math.nan] * len(df), index=df.index)
-    comp2 = comp2.mask(~comp2_3.isna() & (comp2_3 == 0), 0)
-    comp2 = comp2.mask(~comp2_3.isna() & (comp2_3.isin([1, 2])), 1)
-    comp2 = comp2.mask(~comp2_3.isna() & (comp2_3.isin([3, 4])), 2)
-    comp2 = comp2.mask(~comp2_3.isna() & (comp2_3.isin([5, 6])), 3)
-    df["psqi_score_component2"] = comp2
-
-    # Component 3 (sleep duration)
-    comp3 = pd.Series([math.nan] * len(df), index=df.index)
-    if "psqi_4" in df:
-        hours = to_numeric(df["psqi_4"])  # hours slept
-        comp3 = comp3.mask(~hours.isna() & (hours > 7), 0)
-        comp3 = comp3.mask(~hours.isna() & (hours >= 6) & (hours <= 7), 1)
-        comp3 = comp3.mask(~hours.isna() & (hours >= 4) & (hours <= 5), 2)
-        comp3 = comp3.mask(~hours.isna() & (hours < 5), 3)
+    df["psqi_score_component2"] = np.select(
+        [
+            comp2_3 == 0,
+            (comp2_3 == 1) | (comp2_3 == 2),
+            (comp2_3 == 3) | (comp2_3 == 4),
+            (comp2_3 == 5) | (comp2_3 == 6),
+        ],
+        [0.0, 1.0, 2.0, 3.0],
+        default=np.nan,
+    )
+
+    # Hours slept (psqi_4) feeds both component 3 and the efficiency ratio
+    # in component 4, so coerce it to an ndarray once.
+    hours = (
+        to_numeric(df["psqi_4"]).to_numpy(dtype=np.float64) if "psqi_4" in df else None
+    )
+
+    # Component 3 (sleep duration). Conditions are listed in reverse of the
+    # old mask order because the last-applied mask won on overlap (hours < 5
+    # overrides the 4-5 band) while np.select takes the first match.
+    comp3 = np.full(len(df), np.nan)
+    if hours is not None:
+        comp3 = np.select(
+            [
+                hours < 5,
+                (hours >= 4) & (hours <= 5),
+                (hours >= 6) & (hours <= 7),
+                hours > 7,
+            ],
+            [3.0, 2.0, 1.0, 0.0],
+            default=np.nan,
+        )
     df["psqi_score_component3"] = comp3
 
     # Component 4 (habitual sleep efficiency)
     bed_hours = df.get("psqi_1")
     wake_hours = df.get("psqi_3")
-    slept_hours = to_numeric(df.get("psqi_4")) if "psqi_4" in df else None
-    eff_series = pd.Series([math.nan] * len(df), index=df.index)
-    if bed_hours is not None and wake_hours is not None and slept_hours is not None:
-        bed_dec = bed_hours.apply(_parse_hhmm_to_hours)
-        wake_dec = wake_hours.apply(_parse_hhmm_to_hours)
-        in_bed = []
-        for b, w in zip(bed_dec, wake_dec):
-            if b is None or w is None:
-                in_bed.append(math.nan)
-                continue
-            if w >= b:
-                in_bed.append(w - b)
-            else:
-                in_bed.append((24.0 - b) + w)
-        in_bed_series = pd.Series(in_bed, index=df.index)
-        eff_series = (slept_hours / in_bed_series) * 100.0
-        eff_series = eff_series.replace([np.inf, -np.inf], np.nan)
-
-    comp4 = pd.Series([math.nan] * len(df), index=df.index)
-    comp4 = comp4.mask(~eff_series.isna() & (eff_series > 85.0), 0)
-    comp4 = comp4.mask(
-        ~eff_series.isna() & (eff_series <= 84.0) & (eff_series >= 75.0), 1
-    )
-    comp4 = comp4.mask(
-        ~eff_series.isna() & (eff_series <= 74.0) & (eff_series >= 65.0), 2
+    eff = np.full(len(df), np.nan)
+    if bed_hours is not None and wake_hours is not None and hours is not None:
+        bed_dec = _parse_hhmm_to_hours(bed_hours)
+        wake_dec = _parse_hhmm_to_hours(wake_hours)
+        # NaN compares False, so rows with an unparseable time fall through
+        # to (24 - NaN) + NaN and stay NaN, as in the old per-row loop.
+        in_bed = np.where(
+            wake_dec >= bed_dec, wake_dec - bed_dec, (24.0 - bed_dec) + wake_dec
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            eff = (hours / in_bed) * 100.0
+        eff[np.isinf(eff)] = np.nan
+
+    df["psqi_score_component4"] = np.select(
+        [
+            eff > 85.0,
+            (eff >= 75.0) & (eff <= 84.0),
+            (eff >= 65.0) & (eff <= 74.0),
+            eff < 65.0,
+        ],
+        [0.0, 1.0, 2.0, 3.0],
+        default=np.nan,
     )
-    comp4 = comp4.mask(~eff_series.isna() & (eff_series < 65.0), 3)
-    df["psqi_score_component4"] = comp4
     # Manually set to n/a for sub-110354 due to suspicious data.
     df.loc[df["participant_id"] == "sub-110354", "psqi_score_component4"] = math.nan
 
     # Component 5 (sleep disturbances: 5b..5i and 5othera)
-    disturb_cols = [
-        "psqi_5b",
-        "psqi_5c",
-        "psqi_5d",
-        "psqi_5e",
-        "psqi_5f",
-        "psqi_5g",
-        "psqi_5h",
-        "psqi_5i",
-        "psqi_5othera",
-    ]
-    disturb_sum = sum_columns_complete(df, disturb_cols)
-    comp5 = pd.Series([math.nan] * len(df), index=df.index)
-    comp5 = comp5.mask(~disturb_sum.isna() & (disturb_sum == 0), 0)
-    comp5 = comp5.mask(~disturb_sum.isna() & (disturb_sum >= 1) & (disturb_sum <= 9), 1)
-    comp5 = comp5.mask(
-        ~disturb_sum.isna() & (disturb_sum >= 10) & (disturb_sum <= 18), 2
+    disturb_sum = sum_columns_complete(df, PSQI_DISTURB_COLS).to_numpy(
+        dtype=np.float64
     )
-    comp5 = comp5.mask(
-        ~disturb_sum.isna() & (disturb_sum >= 19) & (disturb_sum <= 27), 3
+    df["psqi_score_component5"] = np.select(
+        [
+            disturb_sum == 0,
+            (disturb_sum >= 1) & (disturb_sum <= 9),
+            (disturb_sum >= 10) & (disturb_sum <= 18),
+            (disturb_sum >= 19) & (disturb_sum <= 27),
+        ],
+        [0.0, 1.0, 2.0, 3.0],
+        default=np.nan,
     )
-    df["psqi_score_component5"] = comp5
 
     # Component 6: use of sleeping medication (psqi_7)
     df["psqi_score_component6"] = (
@@ -546,33 +634,28 @@ def add_psqi_scores(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     # Component 7: daytime dysfunction (psqi_8 + psqi_9)
-    comp7_sum = sum_columns_complete(df, ["psqi_8", "psqi_9"])
-    comp7 = pd.Series([math.nan] * len(df), index=df.index)
-    comp7 = comp7.mask(~comp7_sum.isna() & (comp7_sum == 0), 0)
-    comp7 = comp7.mask(~comp7_sum.isna() & (comp7_sum >= 1) & (comp7_sum <= 2), 1)
-    comp7 = comp7.mask(~comp7_sum.isna() & (comp7_sum >= 3) & (comp7_sum <= 4), 2)
-    comp7 = comp7.mask(~comp7_sum.isna() & (comp7_sum >= 5) & (comp7_sum <= 6), 3)
-    df["psqi_score_component7"] = comp7
+    comp7_sum = sum_columns_complete(df, ["psqi_8", "psqi_9"]).to_numpy(
+        dtype=np.float64
+    )
+    df["psqi_score_component7"] = np.select(
+        [
+            comp7_sum == 0,
+            (comp7_sum >= 1) & (comp7_sum <= 2),
+            (comp7_sum >= 3) & (comp7_sum <= 4),
+            (comp7_sum >= 5) & (comp7_sum <= 6),
+        ],
+        [0.0, 1.0, 2.0, 3.0],
+        default=np.nan,
+    )
 
     # Global score
-    comp_cols = [
-        "psqi_score_component1",
-        "psqi_score_component2",
-        "psqi_score_component3",
-        "psqi_score_component4",
-        "psqi_score_component5",
-        "psqi_score_component6",
-        "psqi_score_component7",
-    ]
-    df["psqi_score_global"] = sum_columns_complete(df, comp_cols)
+    df["psqi_score_global"] = sum_columns_complete(df, PSQI_COMPONENT_COLS)
     return df
 
 
 def add_best_ms_scores(df: pd.DataFrame) -> pd.DataFrame:
-    sub_a = [f"best_ms_{i}" for i in range(1, 9)]
-    sub_b = [f"best_ms_{i}" for i in range(9, 13)]
-    a_sum = sum_columns_complete(df, sub_a)
-    b_sum = sum_columns_complete(df, sub_b)
+    a_sum = sum_columns_complete(df, BEST_MS_SUBSCALE_A)
+    b_sum = sum_columns_complete(df, BEST_MS_SUBSCALE_B)
     df["best_score_subscaleA"] = a_sum
     df["best_score_subscaleB"] = b_sum
     df["best_score_finalNoComponentC"] = (a_sum + b_sum).where(
@@ -583,136 +666,61 @@ def add_best_ms_scores(df: pd.DataFrame) -> pd.DataFrame:
 
 def add_biss_madrs_scores(df: pd.DataFrame) -> pd.DataFrame:
     # Reorder columns: participant_id, then biss_1..biss_43, then madrs_1..madrs_10
-    # (BISS in this dataset has 43 items, not 44)
-    biss_cols = [f"biss_{i}" for i in range(1, 44)]
-    madrs_cols = [f"madrs_{i}" for i in range(1, 11)]
     ordered = []
     if PARTICIPANT_ID_COL in df.columns:
         ordered.append(PARTICIPANT_ID_COL)
-    ordered += [c for c in biss_cols if c in df.columns]
-    ordered += [c for c in madrs_cols if c in df.columns]
+    ordered += [c for c in BISS_ITEMS if c in df.columns]
+    ordered += [c for c in MADRS_ITEMS if c in df.columns]
     other = [c for c in df.columns if c not in ordered]
     df = df[ordered + other]
 
-    df["biss_depression"] = sum_columns_complete(df, biss_cols[:22])  # biss_1..biss_22
-    df["biss_mania"] = sum_columns_complete(df, biss_cols[22:])  # biss_23..biss_43
-    df["madrs_total"] = sum_columns_complete(df, madrs_cols)
+    df["biss_depression"] = sum_columns_complete(df, BISS_ITEMS[:22])  # biss_1..biss_22
+    df["biss_mania"] = sum_columns_complete(df, BISS_ITEMS[22:])  # biss_23..biss_43
+    df["madrs_total"] = sum_columns_complete(df, MADRS_ITEMS)
     return df
 
 
 def add_stai_pre_imaging_scores(df: pd.DataFrame) -> pd.DataFrame:
     """STAI pre-scan: 40 items, 19 reverse-coded (5 - x). State = 1–20, Trait = 21–40."""
-    rev_items = [
-        "stai_q_01",
-        "stai_q_02",
-        "stai_q_05",
-        "stai_q_08",
-        "stai_q_10",
-        "stai_q_11",
-        "stai_q_15",
-        "stai_q_16",
-        "stai_q_19",
-        "stai_q_20",
-        "stai_q_21",
-        "stai_q_23",
-        "stai_q_26",
-        "stai_q_27",
-        "stai_q_30",
-        "stai_q_33",
-        "stai_q_34",
-        "stai_q_36",
-        "stai_q_39",
-    ]
-    rev_set = set(rev_items)
-    state_items = [f"stai_q_{i:02d}" for i in range(1, 21)]  # stai_q_01..stai_q_20
-    trait_items = [f"stai_q_{i:02d}" for i in range(21, 41)]  # stai_q_21..stai_q_40
-    all_items = state_items + trait_items
-
-    def score_items(items: List[str]) -> pd.Series:
-        existing = [c for c in items if c in df.columns]
-        if not existing or len(existing) != len(items):
-            return pd.Series([math.nan] * len(df), index=df.index)
-        num = df[existing].apply(pd.to_numeric, errors="coerce")
-        all_present = num.notna().all(axis=1)
-        vals = pd.DataFrame(
-            {
-                c: (reverse_1_to_4(df[c]) if c in rev_set else to_numeric(df[c]))
-                for c in existing
-            }
-        )
-        return vals.sum(axis=1).where(all_present)
-
-    df["stai_total"] = score_items(all_items)
-    df["stai_state"] = score_items(state_items)
-    df["stai_trait"] = score_items(trait_items)
+    all_items = STAI_STATE_ITEMS + STAI_TRAIT_ITEMS
+    df["stai_total"] = sum_items_reversed_subset(df, all_items, STAI_REV_ITEMS)
+    df["stai_state"] = sum_items_reversed_subset(df, STAI_STATE_ITEMS, STAI_REV_ITEMS)
+    df["stai_trait"] = sum_items_reversed_subset(df, STAI_TRAIT_ITEMS, STAI_REV_ITEMS)
     return df
 
 
 def add_stai_post_imaging_scores(df: pd.DataFrame) -> pd.DataFrame:
     """STAI post-scan: state items only (stai_q_01..stai_q_20), same reverse-coding as pre."""
-    rev_items_state = [
-        "stai_q_01",
-        "stai_q_02",
-        "stai_q_05",
-        "stai_q_08",
-        "stai_q_10",
-        "stai_q_11",
-        "stai_q_15",
-        "stai_q_16",
-        "stai_q_19",
-        "stai_q_20",
-    ]
-    rev_set = set(rev_items_state)
-    state_items = [f"stai_q_{i:02d}" for i in range(1, 21)]  # stai_q_01..stai_q_20
-
-    existing = [c for c in state_items if c in df.columns]
-    if not existing or len(existing) != len(state_items):
-        df["post_scan_STAI_state_total_score"] = pd.Series(
-            [math.nan] * len(df), index=df.index
-        )
+    existing = [c for c in STAI_STATE_ITEMS if c in df.columns]
+    if not existing or len(existing) != len(STAI_STATE_ITEMS):
+        df["post_scan_STAI_state_total_score"] = _nan_series(df)
         return df
-    num = df[existing].apply(pd.to_numeric, errors="coerce")
-    all_present = num.notna().all(axis=1)
-    vals = pd.DataFrame(
-        {
-            c: (reverse_1_to_4(df[c]) if c in rev_set else to_numeric(df[c]))
-            for c in existing
-        }
+    df["stai_state"] = sum_items_reversed_subset(
+        df, STAI_STATE_ITEMS, STAI_STATE_REV_ITEMS
     )
-    df["stai_state"] = vals.sum(axis=1).where(all_present)
     return df
 
 
 def add_staxi2_ca_scores(df: pd.DataFrame) -> pd.DataFrame:
     """STAXI-2 CA: 35 items, no reverse-coding. Subscales summed only when all items present."""
-    prefix = "staxi2_ca"
-
-    state_anger = [f"{prefix}_{i}" for i in range(1, 11)]
-    state_anger_feelings = [f"{prefix}_{i}" for i in [1, 2, 3, 8, 10]]
-    state_anger_expression = [f"{prefix}_{i}" for i in [4, 5, 6, 7, 9]]
-
-    trait_anger = [f"{prefix}_{i}" for i in range(11, 21)]
-    trait_anger_temperament = [f"{prefix}_{i}" for i in [11, 12, 13, 16, 19]]
-    trait_anger_reaction = [f"{prefix}_{i}" for i in [14, 15, 17, 18, 20]]
-
     # We aren't 100% sure about these subscales, so we're not scoring them.
-    # anger_expression_out = [f"{prefix}_{i}" for i in [21, 24, 27, 31, 34]]
-    # anger_expression_in = [f"{prefix}_{i}" for i in [22, 25, 28, 33, 35]]
-    # anger_control = [f"{prefix}_{i}" for i in [23, 26, 29, 30, 32]]
+    # anger_expression_out = [f"staxi2_ca_{i}" for i in [21, 24, 27, 31, 34]]
+    # anger_expression_in = [f"staxi2_ca_{i}" for i in [22, 25, 28, 33, 35]]
+    # anger_control = [f"staxi2_ca_{i}" for i in [23, 26, 29, 30, 32]]
 
-    df["staxi2_ca_score_state_anger"] = sum_columns_complete(df, state_anger)
+    df["staxi2_ca_score_state_anger"] = sum_columns_complete(df, STAXI2_STATE_ANGER)
     df["staxi2_ca_score_state_anger_feelings"] = sum_columns_complete(
-        df, state_anger_feelings
+        df, STAXI2_STATE_ANGER_FEELINGS
     )
     df["staxi2_ca_score_state_anger_expression"] = sum_columns_complete(
-        df, state_anger_expression
+        df, STAXI2_STATE_ANGER_EXPRESSION
     )
-    df["staxi2_ca_score_trait_anger"] = sum_columns_complete(df, trait_anger)
+    df["staxi2_ca_score_trait_anger"] = sum_columns_complete(df, STAXI2_TRAIT_ANGER)
     df["staxi2_ca_score_trait_anger_temperament"] = sum_columns_complete(
-        df, trait_anger_temperament
+        df, STAXI2_TRAIT_ANGER_TEMPERAMENT
     )
     df["staxi2_ca_score_trait_anger_reaction"] = sum_columns_complete(
-        df, trait_anger_reaction
+        df, STAXI2_TRAIT_ANGER_REACTION
     )
     # df["staxi2_ca_score_anger_expression_out"] = sum_columns_complete(
     #     df, anger_expression_out
@@ -769,6 +777,9 @@ def score_file(path: Path, out_dir: Path) -> Optional[Path]:
     if scorer is None:
         return None
 
+    # The default C engine: the pyarrow engine rejects a partial dtype dict
+    # whenever an integer-inferred column has a missing cell, which describes
+    # nearly every instrument TSV here.
     df = pd.read_csv(path, sep="\t", dtype={PARTICIPANT_ID_COL: str})
     df = _fill_empty_with_na(df)
     original_cols = list(df.columns)
@@ -796,10 +807,14 @@ def score_file(path: Path, out_dir: Path) -> Optional[Path]:
 
     df = scorer(df)
 
-    # Reorder: preserve current column order for original cols (scorer may have reordered), then new ones
+    # Reorder: preserve current column order for original cols (scorer may
+    # have reordered), then new ones. Scorers append their score columns at
+    # the end, so this usually matches the frame's existing order — only pay
+    # for the full-copy reindex when it does not.
     new_cols = [c for c in df.columns if c not in original_cols]
     ordered = [c for c in df.columns if c in original_cols] + new_cols
-    df = df[ordered]
+    if ordered != list(df.columns):
+        df = df[ordered]
 
     # Clear newly added summary columns for rows that were empty before scoring
     if new_cols:
@@ -810,14 +825,27 @@ def score_file(path: Path, out_dir: Path) -> Optional[Path]:
                 df[c] = s.mask(empty_row_mask, other=pd.NA)
             else:
                 df[c] = s.mask(empty_row_mask, other=math.nan)
-    df = df[ordered]
+
+    # Skip the in-place rewrite when scoring was a no-op: every column the
+    # scorer added is entirely missing and no original column was removed or
+    # reordered. This keeps partial datasets from re-serializing files that
+    # would only gain n/a placeholders; a run with a separate --output-dir
+    # always writes in full.
+    out_path = out_dir / path.name
+    if (
+        new_cols
+        and out_path.exists()
+        and out_path.samefile(path)
+        and [c for c in df.columns if c in original_cols] == original_cols
+        and bool(df[new_cols].isna().all().all())
+    ):
+        return None
 
     # BIDS: empty summary scores and any remaining missing → "n/a"
     # Convert column-by-column so Int64 (and other non-object) columns can hold "n/a"
     for c in df.columns:
         df[c] = df[c].astype(object).fillna("n/a")
 
-    out_path = out_dir / path.name
     out_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(out_path, sep="\t", index=False)
     return out_path
@@ -850,10 +878,21 @@ def main(argv: Iterable[str]) -> int:
         print(f"No TSV files found in {input_dir}")
         return 0
 
+    # Each instrument file is scored independently (score_file reads one
+    # path and writes one path, touching no shared state), so fan the files
+    # out across worker processes; map returns results in input order.
+    workers = min(len(tsv_files), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(partial(score_file, out_dir=output_dir), tsv_files)
+            )
+    else:
+        results = [score_file(f, output_dir) for f in tsv_files]
+
     wrote = 0
     skipped: List[str] = []
-    for f in tsv_files:
-        out = score_file(f, output_dir)
+    for f, out in zip(tsv_files, results):
         if out is None:
             skipped.append(f.name)
             continue